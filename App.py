@@ -15,7 +15,17 @@ logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
 # BOT SETUP
 intents = discord.Intents.all()
 intents.members = True
-bot = commands.Bot(command_prefix="!", intents=intents)
+
+class Bot(commands.Bot):
+    async def close(self):
+        # Les cogs sont déchargés (et leurs écritures différées vidées) avant la fermeture du pool MySQL
+        await super().close()
+        # Import local : le module lit les variables d'environnement, qui ne sont chargées qu'après les imports
+        from modules.Database import async_db
+        async_db.close()
+        logging.info("Connexions MySQL fermées")
+
+bot = Bot(command_prefix="!", intents=intents)
 
 # STARTUP EVENT
 @bot.event
@@ -17,19 +17,42 @@ GoodbyeMessage = "Au revoir, {member} ! Tu vas nous manquer."
 LogsChannel = 1461276988865253500
 LogsEnabled = True
 
+GiveawayParticipantFlushInterval = 2  # Interval (in seconds) between batched writes of giveaway participations
+GiveawayJournalFile = "data/giveaway_participants.journal"  # Participations are journaled here until written to the database
+GiveawayEmbedUpdateInterval = 15  # Minimum time (in seconds) between two edits of a giveaway message to refresh its participant count
+GiveawayDMConcurrency = 5  # Maximum number of winner DMs sent at the same time
+GiveawayDMAttempts = 3  # Attempts per winner DM on transient errors (5xx, network), with exponential backoff
+GiveawayClaimLease = 300  # Time (in seconds) after which an interrupted giveaway finalization can be resumed by another run
+
 TicketChannel = 1461708320434950335
 
 TicketAutoPingRole = 1461709099774509169 # When users with this role send a message, the bot will ping the author of the ticket
+TicketAutoPingCooldown = 300  # Minimum time (in seconds) between two auto-pings in the same ticket
+
+TicketMaxOpenPerUser = 0  # Max number of open tickets per user (0 = unlimited)
 
 TicketAutoCloseDelay = 12  # Auto close time when a staff answer and ther isnt response from user, in hours
 
+TicketTranscriptFormat = "html"  # "txt", "html" or "ndjson"
+TicketTranscriptCompress = False  # Compress transcripts with gzip (.gz)
+TicketTranscriptDir = "data/transcripts"  # Directory where ticket messages are captured live (one NDJSON file per ticket)
+
+TicketArchiveAfter = 0  # Closed tickets are archived (transcript saved, channel deleted) after this many hours (0 = disabled)
+TicketArchiveConcurrency = 2  # Max number of tickets archived at the same time
+
+TicketActivityFlushInterval = 5  # Interval (in seconds) between batched writes of ticket activity timestamps
+TicketClosedCacheSize = 500  # Max number of closed tickets kept in memory (older ones are read from the database)
+TicketClosedCacheTTL = 3600  # Time (in seconds) a closed ticket stays in memory
+
 TicketTypes = {
     "test1": {
         "name": "Test 1",
         "description": "Description du ticket de test 1",
-        "category_id": 1461708362042314938,
+        "category_id": 1461708362042314938,  # A category ID or a list of IDs, tickets go to the least loaded one
+        "overflow_category": "Tickets Test 1",  # Optional: when all categories are full (50 channels), "Tickets Test 1 2", "... 3" are created
         "staff_roles_id": [1461708434402443274, 1461709099774509169],
-        "roles_to_ping": [1461708434402443274]
+        "roles_to_ping": [1461708434402443274],
+        "pool_size": 0  # Hidden channels pre-created for this type to open tickets faster (0 = disabled)
     },
     "test2": {
         "name": "Test 2",
@@ -1,17 +1,152 @@
 import discord
 from discord import app_commands
-from discord.ext import commands, tasks
+from discord.ext import commands
 from datetime import datetime, timedelta
+import asyncio
+import json
 import logging
 import random
-from modules.Database import db
+import time
+import uuid
+from typing import Dict, Set
+from modules.Database import async_db
+from modules.Scheduler import DeadlineScheduler
+from modules.GiveawayParticipants import ParticipantStore
+from modules.WinnerNotifier import WinnerNotifier
 from config import Config
 from modules.I18n import t
 
+DEADLINE_LOAD_ATTEMPTS = 3  # Tentatives de chargement des échéances au démarrage
+
+
 class GiveawayCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.check_giveaways.start()
+        # Un tas (fin, giveaway_id) et une seule tâche qui dort jusqu'à la prochaine échéance
+        self.end_scheduler = DeadlineScheduler("GiveawayEnd")
+        self.participants = ParticipantStore(
+            getattr(Config, "GiveawayJournalFile", "data/giveaway_participants.journal"),
+            getattr(Config, "GiveawayParticipantFlushInterval", 2)
+        )
+        # Mise à jour différée des embeds : au plus une édition par intervalle et par giveaway,
+        # uniquement si le rendu a changé
+        self.embed_update_interval = getattr(Config, "GiveawayEmbedUpdateInterval", 15)
+        self.embed_update_tasks: Dict[str, asyncio.Task] = {}
+        self.embed_dirty: Set[str] = set()
+        self.embed_edits: Dict[str, asyncio.Future] = {}
+        self.embed_last_edit: Dict[str, float] = {}
+        self.embed_rendered: Dict[str, str] = {}
+        # Bail d'une finalisation : au-delà, une autre instance (ou un redémarrage) peut la reprendre
+        self.claim_lease = getattr(Config, "GiveawayClaimLease", 300)
+        self.drawn: Set[str] = set()
+        self.notifier = WinnerNotifier(
+            bot,
+            getattr(Config, "GiveawayDMConcurrency", 5),
+            getattr(Config, "GiveawayDMAttempts", 3)
+        )
+
+    async def cog_load(self):
+        await async_db.migrate_giveaway_participants()
+        await async_db.migrate_giveaway_state()
+        await self.participants.recover()
+        self.participants.start()
+        deadlines = None
+        for attempt in range(DEADLINE_LOAD_ATTEMPTS):
+            deadlines = await async_db.get_giveaway_deadlines()
+            if deadlines is not None:
+                break
+            await asyncio.sleep(2 ** attempt)
+        if deadlines is None:
+            # Sans échéances, aucun giveaway actif ne se terminerait avant le prochain redémarrage
+            await self.participants.stop()
+            raise RuntimeError("Impossible de charger les échéances des giveaways")
+        for giveaway_id, end_date in deadlines:
+            self.end_scheduler.schedule(giveaway_id, end_date)
+        self.end_scheduler.start(self.finish_giveaway)
+        logging.info(f"{len(self.end_scheduler)} giveaways actifs planifiés")
+
+    async def cog_unload(self):
+        self.end_scheduler.stop()
+        for task in self.embed_update_tasks.values():
+            task.cancel()
+        await self.participants.stop()
+
+    def request_embed_update(self, giveaway_id: str):
+        self.embed_dirty.add(giveaway_id)
+        task = self.embed_update_tasks.get(giveaway_id)
+        if task is None or task.done():
+            self.embed_update_tasks[giveaway_id] = asyncio.create_task(self._update_embed(giveaway_id))
+
+    async def settle_embed(self, giveaway_id: str):
+        """Arrête les mises à jour du compteur et attend une édition déjà partie, pour que
+        l'embed final ne soit jamais écrasé par un rafraîchissement tardif."""
+        self.embed_dirty.discard(giveaway_id)
+        task = self.embed_update_tasks.pop(giveaway_id, None)
+        if task and task is not asyncio.current_task():
+            task.cancel()
+        pending_edit = self.embed_edits.get(giveaway_id)
+        if pending_edit is not None:
+            await asyncio.wait([pending_edit])
+
+    def forget_embed(self, giveaway_id: str):
+        self.embed_dirty.discard(giveaway_id)
+        task = self.embed_update_tasks.pop(giveaway_id, None)
+        if task and task is not asyncio.current_task():
+            task.cancel()
+        self.embed_last_edit.pop(giveaway_id, None)
+        self.embed_rendered.pop(giveaway_id, None)
+
+    def _edit_done(self, giveaway_id: str, future: asyncio.Future):
+        if self.embed_edits.get(giveaway_id) is future:
+            del self.embed_edits[giveaway_id]
+        if not future.cancelled():
+            future.exception()  # Déjà journalisée par _update_embed ; évite l'avertissement d'asyncio
+
+    async def _update_embed(self, giveaway_id: str):
+        try:
+            # La tâche reste enregistrée jusqu'à la fin : les clics reçus pendant une édition
+            # relancent simplement la boucle
+            while giveaway_id in self.embed_dirty:
+                delay = self.embed_last_edit.get(giveaway_id, 0) + self.embed_update_interval - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self.embed_dirty.discard(giveaway_id)
+                if not self.is_open(giveaway_id):
+                    return
+
+                giveaway_data = await async_db.get_giveaway(giveaway_id)
+                if not giveaway_data or not giveaway_data.get("giveaway_message_id"):
+                    return
+                giveaway_data["giveaway_participant_count"] = self.participants.count(giveaway_id)
+                embed = self.create_giveaway_embed(giveaway_data, ongoing=True)
+                rendered = json.dumps(embed.to_dict(), sort_keys=True)
+                if rendered == self.embed_rendered.get(giveaway_id):
+                    continue
+
+                channel = self.bot.get_channel(int(giveaway_data["giveaway_channel_id"]))
+                # Le tirage a pu commencer pendant la lecture en BDD
+                if channel is None or not self.is_open(giveaway_id):
+                    return
+                self.embed_last_edit[giveaway_id] = time.monotonic()
+                pending_edit = asyncio.ensure_future(
+                    channel.get_partial_message(int(giveaway_data["giveaway_message_id"])).edit(embed=embed)
+                )
+                self.embed_edits[giveaway_id] = pending_edit
+                pending_edit.add_done_callback(lambda future: self._edit_done(giveaway_id, future))
+                # Protégée : annuler la tâche n'interrompt pas une requête déjà envoyée
+                await asyncio.shield(pending_edit)
+                self.embed_rendered[giveaway_id] = rendered
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logging.warning(f"Impossible de mettre à jour l'embed du giveaway {giveaway_id} : {str(e)}")
+        finally:
+            if self.embed_update_tasks.get(giveaway_id) is asyncio.current_task():
+                del self.embed_update_tasks[giveaway_id]
+
+    def is_open(self, giveaway_id: str) -> bool:
+        """Un giveaway accepte des participants tant que son échéance est planifiée."""
+        return giveaway_id in self.end_scheduler and giveaway_id not in self.drawn
     
     async def send_giveaway_log(self, embed: discord.Embed):
         if "giveaway" in Config.Logs and Config.Logs["giveaway"]["enabled"]:
@@ -85,7 +220,7 @@ class GiveawayCog(commands.Cog):
             giveaway_id = str(int(datetime.now().timestamp() * 1000))
             server_id = str(interaction.guild.id)
             
-            success = db.create_giveaway(
+            success = await async_db.create_giveaway(
                 giveaway_id=giveaway_id,
                 server_id=server_id,
                 channel_id=str(interaction.channel.id),
@@ -104,10 +239,13 @@ class GiveawayCog(commands.Cog):
                 )
                 return
             
-            giveaway_data = db.get_giveaway(giveaway_id)
+            giveaway_data = await async_db.get_giveaway(giveaway_id)
             embed = self.create_giveaway_embed(giveaway_data, ongoing=True)
             message = await interaction.channel.send(embed=embed)
-            db.update_giveaway_message_id(giveaway_id, message.id)
+            self.embed_rendered[giveaway_id] = json.dumps(embed.to_dict(), sort_keys=True)
+            self.embed_last_edit[giveaway_id] = time.monotonic()
+            await async_db.update_giveaway_message_id(giveaway_id, message.id)
+            self.end_scheduler.schedule(giveaway_id, fin_giveaway)
             view = GiveawayView(self, giveaway_id)
             await message.edit(view=view)
             
@@ -150,12 +288,10 @@ class GiveawayCog(commands.Cog):
         couleur = discord.Color.gold() if ongoing else discord.Color.green()
         
         fin_datetime = giveaway_data["giveaway_end_date"]
-        temps_restant = fin_datetime - datetime.now()
         
-        if temps_restant.total_seconds() > 0:
-            heures = int(temps_restant.total_seconds() // 3600)
-            minutes = int((temps_restant.total_seconds() % 3600) // 60)
-            temps_str = f"{heures}h {minutes}m" if heures > 0 else f"{minutes}m"
+        # Horodatage relatif : Discord affiche le compte à rebours sans qu'on édite le message
+        if fin_datetime > datetime.now():
+            temps_str = f"<t:{int(fin_datetime.timestamp())}:R>"
         else:
             temps_str = t("giveaway.embed.ended", "Terminé")
         
@@ -191,11 +327,11 @@ class GiveawayCog(commands.Cog):
         
         embed.add_field(
             name=t("giveaway.embed.participants_field", "📊 Participants"),
-            value=str(len(giveaway_data["giveaway_participants"])),
+            value=str(giveaway_data.get("giveaway_participant_count", 0)),
             inline=True
         )
         
-        date_fin_str = fin_datetime.strftime("%d/%m/%Y à %H:%M")
+        date_fin_str = f"<t:{int(fin_datetime.timestamp())}:F>"
         embed.add_field(
             name=t("giveaway.embed.end_field", "📅 Fin"),
             value=date_fin_str,
@@ -209,34 +345,92 @@ class GiveawayCog(commands.Cog):
         
         return embed
 
-    @tasks.loop(minutes=1)
-    async def check_giveaways(self):
+    def _release(self, giveaway_id: str):
+        self.drawn.discard(giveaway_id)
+        self.participants.forget(giveaway_id)
+        self.forget_embed(giveaway_id)
+
+    async def finish_giveaway(self, giveaway_id: str):
+        """Finalisation en machine à états : active -> drawing -> announced.
+
+        Chaque transition est un UPDATE conditionnel qui sert de jeton : un seul tick ou une
+        seule instance peut tirer les gagnants, et ils sont enregistrés avant tout message.
+        Un giveaway resté en 'drawing' après un arrêt est repris avec les mêmes gagnants.
+        """
         try:
-            now = datetime.now()
-            active_giveaways = db.get_active_giveaways()
-            
-            for giveaway_data in active_giveaways:
-                fin_datetime = giveaway_data["giveaway_end_date"]
-                
-                if now >= fin_datetime:
-                    await self.end_giveaway(giveaway_data["giveaway_id"], giveaway_data)
-                    db.mark_giveaway_finished(giveaway_data["giveaway_id"])
-                
+            giveaway_data = await async_db.load_giveaway(giveaway_id)
+            if giveaway_data is None:
+                # Erreur BDD : l'entrée a déjà quitté le tas, on la replanifie
+                self.end_scheduler.schedule(giveaway_id, datetime.now() + timedelta(minutes=1))
+                return
+            if not giveaway_data or giveaway_data["giveaway_state"] == "announced":
+                self._release(giveaway_id)
+                return
+
+            token = uuid.uuid4().hex
+            if giveaway_data["giveaway_state"] == "active":
+                if giveaway_data["giveaway_end_date"] > datetime.now():
+                    # Date de fin modifiée entre-temps : on replanifie
+                    self.end_scheduler.schedule(giveaway_id, giveaway_data["giveaway_end_date"])
+                    return
+
+                # Plus d'inscriptions ; celles de cette instance doivent être en BDD avant le tirage
+                self.drawn.add(giveaway_id)
+                if not await self.participants.flush():
+                    logging.warning(f"Participants du giveaway {giveaway_id} indisponibles, nouvel essai dans 1 minute")
+                    self.end_scheduler.schedule(giveaway_id, datetime.now() + timedelta(minutes=1))
+                    return
+                claimed = await async_db.claim_giveaway_draw(giveaway_id, token)
+            else:
+                self.drawn.add(giveaway_id)
+                claimed = await async_db.reclaim_giveaway_draw(giveaway_id, token, self.claim_lease)
+
+            if not claimed:
+                # Finalisation en cours ailleurs : on revérifie à l'expiration de son bail
+                self.end_scheduler.schedule(giveaway_id, datetime.now() + timedelta(seconds=self.claim_lease))
+                return
+
+            if giveaway_data.get("giveaway_winners") is None:
+                # Tirage depuis la BDD : elle contient aussi les inscriptions écrites par les autres instances
+                participants = await async_db.load_participants(giveaway_id)
+                gagnants = None
+                if participants is not None:
+                    gagnants = random.sample(participants, min(giveaway_data["giveaway_winner_count"], len(participants)))
+                if gagnants is None or not await async_db.set_giveaway_winners(giveaway_id, gagnants, token):
+                    logging.warning(f"Tirage du giveaway {giveaway_id} non enregistré, reprise à l'expiration du bail")
+                    self.end_scheduler.schedule(giveaway_id, datetime.now() + timedelta(seconds=self.claim_lease))
+                    return
+                giveaway_data["giveaway_winners"] = gagnants
+                giveaway_data["giveaway_participant_count"] = len(participants)
+
+            await self.settle_embed(giveaway_id)
+            if await self.end_giveaway(giveaway_id, giveaway_data, token):
+                self._release(giveaway_id)
+            else:
+                self.end_scheduler.schedule(giveaway_id, datetime.now() + timedelta(seconds=self.claim_lease))
         except Exception as e:
             logging.error(f"Erreur vérification giveaways : {str(e)}")
+            self.end_scheduler.schedule(giveaway_id, datetime.now() + timedelta(minutes=1))
 
-    async def end_giveaway(self, giveaway_id: str, giveaway_data: dict):
+    async def end_giveaway(self, giveaway_id: str, giveaway_data: dict, token: str) -> bool:
+        """Annonce les gagnants enregistrés. Retourne False si l'annonce est à retenter."""
         try:
             canal = self.bot.get_channel(int(giveaway_data["giveaway_channel_id"]))
             if not canal:
-                canal = await self.bot.fetch_channel(int(giveaway_data["giveaway_channel_id"]))
+                try:
+                    canal = await self.bot.fetch_channel(int(giveaway_data["giveaway_channel_id"]))
+                except (discord.NotFound, discord.Forbidden):
+                    canal = None
             
             if not canal:
+                # Rien ne pourra être annoncé : les gagnants restent enregistrés en BDD
                 logging.error(f"Impossible de trouver le canal {giveaway_data['giveaway_channel_id']}")
-                return
+                await async_db.mark_giveaway_announced(giveaway_id, token)
+                return True
             
-            participants = giveaway_data["giveaway_participants"]
-            nombre_gagnants = min(giveaway_data["giveaway_winner_count"], len(participants))
+            gagnants = giveaway_data.get("giveaway_winners") or []
+            participant_count = giveaway_data.get("giveaway_participant_count", 0)
+            nombre_gagnants = len(gagnants)
             
             if nombre_gagnants == 0:
                 embed_annule = discord.Embed(
@@ -253,10 +447,9 @@ class GiveawayCog(commands.Cog):
                         logging.warning(f"Impossible de modifier le message original : {str(e)}")
                 
                 await canal.send(embed=embed_annule)
+                await async_db.mark_giveaway_announced(giveaway_id, token)
                 logging.info(f"Giveaway {giveaway_id} annulé : pas de participants")
-                return
-            
-            gagnants = random.sample(participants, nombre_gagnants)
+                return True
             
             embed_original = discord.Embed(
                 title=f"🎉 {giveaway_data['giveaway_title']} - Terminé",
@@ -285,7 +478,7 @@ class GiveawayCog(commands.Cog):
             
             embed_original.add_field(
                 name="👥 Total participants",
-                value=str(len(participants)),
+                value=str(participant_count),
                 inline=True
             )
             
@@ -324,23 +517,22 @@ class GiveawayCog(commands.Cog):
             )
             
             await canal.send(embed=embed_annonce)
-            
-            for gagnant_id in gagnants:
-                try:
-                    user = await self.bot.fetch_user(gagnant_id)
-                    dm_embed = discord.Embed(
-                        title="🎉 Vous avez gagné !",
-                        description=f"Félicitations ! Vous avez gagné le giveaway **{giveaway_data['giveaway_title']}**",
-                        color=discord.Color.gold()
-                    )
-                    dm_embed.add_field(
-                        name="🎁 Prix",
-                        value="\n".join([f"• {prix}" for prix in giveaway_data["giveaway_prizes"]]),
-                        inline=False
-                    )
-                    await user.send(embed=dm_embed)
-                except Exception as e:
-                    logging.warning(f"Impossible d'envoyer un MP au gagnant {gagnant_id} : {str(e)}")
+            # Annonce faite : on clôt avant les MP pour qu'une reprise ne la répète pas
+            if not await async_db.mark_giveaway_announced(giveaway_id, token):
+                logging.warning(f"Giveaway {giveaway_id} : jeton de finalisation perdu après l'annonce")
+                return True
+            
+            dm_embed = discord.Embed(
+                title="🎉 Vous avez gagné !",
+                description=f"Félicitations ! Vous avez gagné le giveaway **{giveaway_data['giveaway_title']}**",
+                color=discord.Color.gold()
+            )
+            dm_embed.add_field(
+                name="🎁 Prix",
+                value="\n".join([f"• {prix}" for prix in giveaway_data["giveaway_prizes"]]),
+                inline=False
+            )
+            report = await self.notifier.notify(gagnants, dm_embed)
             
             log_embed = discord.Embed(
                 title="🏆 Giveaway terminé",
@@ -350,22 +542,25 @@ class GiveawayCog(commands.Cog):
             )
             log_embed.add_field(name="🎁 Prix", value="\n".join([f"• {prix}" for prix in giveaway_data["giveaway_prizes"]]), inline=False)
             log_embed.add_field(name="🏆 Gagnants", value=gagnants_mentions, inline=False)
-            log_embed.add_field(name="👥 Participants", value=str(len(participants)), inline=True)
+            log_embed.add_field(name="👥 Participants", value=str(participant_count), inline=True)
             log_embed.add_field(name="📍 Canal", value=f"<#{giveaway_data['giveaway_channel_id']}>", inline=True)
+            log_embed.add_field(name="📬 MP aux gagnants", value=report.summary(), inline=False)
             log_embed.set_footer(text=f"ID: {giveaway_id}")
             
             await self.send_giveaway_log(log_embed)
             
             logging.info(f"Giveaway {giveaway_id} terminé avec {nombre_gagnants} gagnants")
+            return True
             
         except Exception as e:
             logging.error(f"Erreur terminaison giveaway {giveaway_id} : {str(e)}")
+            return False
 
     @app_commands.command(name="giveaway_participants", description=t("giveaway.commands.participants_description", "Affiche les participants du giveaway"))
     @app_commands.checks.has_permissions(administrator=True)
     async def giveaway_participants(self, interaction: discord.Interaction):
         try:
-            giveaway_data = db.get_active_giveaway_by_channel(str(interaction.channel.id))
+            giveaway_data = await async_db.get_active_giveaway_by_channel(str(interaction.channel.id))
             
             if not giveaway_data:
                 await interaction.response.send_message(
@@ -374,7 +569,7 @@ class GiveawayCog(commands.Cog):
                 )
                 return
             
-            participants = giveaway_data["giveaway_participants"]
+            participants = await self.participants.members(giveaway_data["giveaway_id"])
             
             if not participants:
                 await interaction.response.send_message(
@@ -407,7 +602,7 @@ class GiveawayCog(commands.Cog):
     @app_commands.checks.has_permissions(administrator=True)
     async def giveaway_delete(self, interaction: discord.Interaction, message_id: str):
         try:
-            giveaway_data = db.get_giveaway_by_message_id(message_id)
+            giveaway_data = await async_db.get_giveaway_by_message_id(message_id)
             
             if not giveaway_data:
                 await interaction.response.send_message(
@@ -431,7 +626,11 @@ class GiveawayCog(commands.Cog):
             except Exception as e:
                 logging.warning(f"Impossible de supprimer le message : {str(e)}")
             
-            success = db.delete_giveaway(giveaway_data["giveaway_id"])
+            success = await async_db.delete_giveaway(giveaway_data["giveaway_id"])
+            self.end_scheduler.cancel(giveaway_data["giveaway_id"])
+            self.participants.discard(giveaway_data["giveaway_id"])
+            self.forget_embed(giveaway_data["giveaway_id"])
+            self.drawn.discard(giveaway_data["giveaway_id"])
             
             if success:
                 await interaction.response.send_message(
@@ -447,7 +646,7 @@ class GiveawayCog(commands.Cog):
                 )
                 log_embed.add_field(name="📝 Titre", value=giveaway_data['giveaway_title'], inline=False)
                 log_embed.add_field(name="🎁 Prix", value="\n".join([f"• {prix}" for prix in giveaway_data["giveaway_prizes"]]), inline=False)
-                log_embed.add_field(name="👥 Participants", value=str(len(giveaway_data["giveaway_participants"])), inline=True)
+                log_embed.add_field(name="👥 Participants", value=str(giveaway_data["giveaway_participant_count"]), inline=True)
                 log_embed.add_field(name="📍 Canal", value=f"<#{giveaway_data['giveaway_channel_id']}>", inline=True)
                 log_embed.set_footer(text=f"Supprimé par {interaction.user.name} | ID: {giveaway_data['giveaway_id']}")
                 
@@ -480,7 +679,7 @@ class GiveawayCog(commands.Cog):
         nombre_gagnants: int = 1
     ):
         try:
-            giveaway_data = db.get_giveaway_by_message_id(message_id)
+            giveaway_data = await async_db.get_giveaway_by_message_id(message_id)
             
             if not giveaway_data:
                 await interaction.response.send_message(
@@ -503,7 +702,7 @@ class GiveawayCog(commands.Cog):
                 )
                 return
             
-            participants = giveaway_data["giveaway_participants"]
+            participants = await async_db.get_participants(giveaway_data["giveaway_id"])
             
             if len(participants) < nombre_gagnants:
                 await interaction.response.send_message(
@@ -540,22 +739,17 @@ class GiveawayCog(commands.Cog):
             if channel:
                 await channel.send(embed=embed)
             
-            for gagnant_id in nouveaux_gagnants:
-                try:
-                    user = await self.bot.fetch_user(gagnant_id)
-                    dm_embed = discord.Embed(
-                        title=t("giveaway.reroll.dm_title", "🎉 Vous avez gagné (Reroll) !"),
-                        description=t("giveaway.reroll.dm_description", "Félicitations ! Vous avez été sélectionné lors du reroll du giveaway **{title}**", title=giveaway_data['giveaway_title']),
-                        color=discord.Color.purple()
-                    )
-                    dm_embed.add_field(
-                        name="🎁 Prix",
-                        value="\n".join([f"• {prix}" for prix in giveaway_data["giveaway_prizes"]]),
-                        inline=False
-                    )
-                    await user.send(embed=dm_embed)
-                except Exception as e:
-                    logging.warning(f"Impossible d'envoyer un MP au gagnant {gagnant_id} : {str(e)}")
+            dm_embed = discord.Embed(
+                title=t("giveaway.reroll.dm_title", "🎉 Vous avez gagné (Reroll) !"),
+                description=t("giveaway.reroll.dm_description", "Félicitations ! Vous avez été sélectionné lors du reroll du giveaway **{title}**", title=giveaway_data['giveaway_title']),
+                color=discord.Color.purple()
+            )
+            dm_embed.add_field(
+                name="🎁 Prix",
+                value="\n".join([f"• {prix}" for prix in giveaway_data["giveaway_prizes"]]),
+                inline=False
+            )
+            report = await self.notifier.notify(nouveaux_gagnants, dm_embed)
             
             await interaction.followup.send(
                 t("giveaway.reroll.success_one", "✅ Reroll effectué ! {winner_count} nouveau gagnant tiré.", winner_count=nombre_gagnants) if nombre_gagnants == 1 else t("giveaway.reroll.success_many", "✅ Reroll effectué ! {winner_count} nouveaux gagnants tirés.", winner_count=nombre_gagnants),
@@ -572,6 +766,7 @@ class GiveawayCog(commands.Cog):
             log_embed.add_field(name="🎁 Prix", value="\n".join([f"• {prix}" for prix in giveaway_data["giveaway_prizes"]]), inline=False)
             log_embed.add_field(name="👥 Nombre de gagnants", value=str(nombre_gagnants), inline=True)
             log_embed.add_field(name="📍 Canal", value=f"<#{giveaway_data['giveaway_channel_id']}>", inline=True)
+            log_embed.add_field(name="📬 MP aux gagnants", value=report.summary(), inline=False)
             log_embed.set_footer(text=f"Reroll par {interaction.user.name} | ID: {giveaway_data['giveaway_id']}")
             
             await self.send_giveaway_log(log_embed)
@@ -601,46 +796,40 @@ class GiveawayView(discord.ui.View):
     @discord.ui.button(label=t("giveaway.participation.button_label", "Participer 🎉"), style=discord.ButtonStyle.primary)
     async def participate(self, interaction: discord.Interaction, button: discord.ui.Button):
         try:
-            giveaway_data = db.get_giveaway(self.giveaway_id)
-            
-            if not giveaway_data:
+            if not self.cog.is_open(self.giveaway_id):
+                giveaway_data = await async_db.get_giveaway(self.giveaway_id)
                 await interaction.response.send_message(
-                    t("giveaway.participation.no_longer_exists", "❌ Ce giveaway n'existe plus."),
-                    ephemeral=True
-                )
-                return
-            
-            if giveaway_data["giveaway_is_finished"]:
-                await interaction.response.send_message(
-                    t("giveaway.participation.already_finished", "❌ Ce giveaway est terminé."),
+                    t("giveaway.participation.already_finished", "❌ Ce giveaway est terminé.") if giveaway_data
+                    else t("giveaway.participation.no_longer_exists", "❌ Ce giveaway n'existe plus."),
                     ephemeral=True
                 )
                 return
             
             user_id = interaction.user.id
             
-            if user_id in giveaway_data["giveaway_participants"]:
-                view = UnsubscribeView(self.giveaway_id)
+            added = await self.cog.participants.join(self.giveaway_id, user_id)
+            
+            if added is None:
                 await interaction.response.send_message(
-                    t("giveaway.participation.already_participating", "⚠️ Vous participez déjà à ce giveaway !\nVoulez-vous vous désinscrire ?"),
-                    view=view,
+                    t("giveaway.participation.add_participation_error", "❌ Erreur lors de l'ajout de votre participation."),
                     ephemeral=True
                 )
                 return
             
-            success = db.add_participant(self.giveaway_id, user_id)
-            
-            if not success:
+            if not added:
+                view = UnsubscribeView(self.cog, self.giveaway_id)
                 await interaction.response.send_message(
-                    t("giveaway.participation.add_participation_error", "❌ Erreur lors de l'ajout de votre participation."),
+                    t("giveaway.participation.already_participating", "⚠️ Vous participez déjà à ce giveaway !\nVoulez-vous vous désinscrire ?"),
+                    view=view,
                     ephemeral=True
                 )
                 return
             
-            giveaway_data = db.get_giveaway(self.giveaway_id)
+            participant_count = self.cog.participants.count(self.giveaway_id)
+            self.cog.request_embed_update(self.giveaway_id)
             
             await interaction.response.send_message(
-                t("giveaway.participation.joined_success", "✅ Vous participez au giveaway ! ({participant_count} participant(s))", participant_count=len(giveaway_data['giveaway_participants'])),
+                t("giveaway.participation.joined_success", "✅ Vous participez au giveaway ! ({participant_count} participant(s))", participant_count=participant_count),
                 ephemeral=True
             )
             
@@ -655,32 +844,26 @@ class GiveawayView(discord.ui.View):
 
 
 class UnsubscribeView(discord.ui.View):
-    def __init__(self, giveaway_id: str):
+    def __init__(self, cog: GiveawayCog, giveaway_id: str):
         super().__init__(timeout=60)
+        self.cog = cog
         self.giveaway_id = giveaway_id
 
     @discord.ui.button(label=t("giveaway.unsubscribe.button_label", "Se désinscrire"), style=discord.ButtonStyle.danger)
     async def unsubscribe(self, interaction: discord.Interaction, button: discord.ui.Button):
         try:
-            giveaway_data = db.get_giveaway(self.giveaway_id)
-            
-            if not giveaway_data:
-                await interaction.response.edit_message(
-                    content=t("giveaway.participation.no_longer_exists", "❌ Ce giveaway n'existe plus."),
-                    view=None
-                )
-                return
-            
-            if giveaway_data["giveaway_is_finished"]:
+            if not self.cog.is_open(self.giveaway_id):
+                giveaway_data = await async_db.get_giveaway(self.giveaway_id)
                 await interaction.response.edit_message(
-                    content=t("giveaway.participation.already_finished", "❌ Ce giveaway est terminé."),
+                    content=t("giveaway.participation.already_finished", "❌ Ce giveaway est terminé.") if giveaway_data
+                    else t("giveaway.participation.no_longer_exists", "❌ Ce giveaway n'existe plus."),
                     view=None
                 )
                 return
             
             user_id = interaction.user.id
             
-            success = db.remove_participant(self.giveaway_id, user_id)
+            success = await self.cog.participants.leave(self.giveaway_id, user_id)
             
             if not success:
                 await interaction.response.edit_message(
@@ -689,10 +872,11 @@ class UnsubscribeView(discord.ui.View):
                 )
                 return
             
-            giveaway_data = db.get_giveaway(self.giveaway_id)
+            participant_count = self.cog.participants.count(self.giveaway_id)
+            self.cog.request_embed_update(self.giveaway_id)
             
             await interaction.response.edit_message(
-                content=t("giveaway.unsubscribe.left_success", "✅ Vous ne participez plus au giveaway. ({participant_count} participant(s))", participant_count=len(giveaway_data['giveaway_participants'])),
+                content=t("giveaway.unsubscribe.left_success", "✅ Vous ne participez plus au giveaway. ({participant_count} participant(s))", participant_count=participant_count),
                 view=None
             )
             
@@ -1,34 +1,30 @@
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from discord import app_commands
 from datetime import datetime, timedelta
 import logging
-from typing import Optional
+import time
+from typing import Dict, Optional, Tuple
 import asyncio
 
 from config import Config
 from modules.TicketManager import TicketManager
+from modules.ChannelRenamer import ChannelRenamer, RenameResult
+from modules.ChannelPool import ChannelPool
+from modules.CategoryPlacer import CategoryPlacer
+from modules.TicketTypeRegistry import TicketTypeRegistry
+from modules.Database import async_db
 from modules.I18n import t
+from modules.Transcript import TranscriptStore, message_to_record, transcript_title, write_channel_transcript
 
 class TicketTypeSelect(discord.ui.Select):
     def __init__(self, cog: "TicketsCog"):
         self.cog = cog
-        
-        options = []
-        for key, ticket_type in Config.TicketTypes.items():
-            options.append(
-                discord.SelectOption(
-                    label=ticket_type["name"],
-                    description=ticket_type["description"],
-                    value=key
-                )
-            )
-        
         super().__init__(
             placeholder=t("tickets.ui.select_placeholder", "Choisissez un type de ticket"),
             min_values=1,
             max_values=1,
-            options=options
+            options=list(cog.ticket_types.select_options)
         )
 
     async def callback(self, interaction: discord.Interaction):
@@ -41,69 +37,83 @@ class TicketTypeSelectView(discord.ui.View):
         self.add_item(TicketTypeSelect(cog))
 
 
-class TicketActionView(discord.ui.View):
-    def __init__(self, cog: "TicketsCog", ticket_channel_id: int):
-        super().__init__(timeout=None)
-        self.cog = cog
-        self.ticket_channel_id = ticket_channel_id
+# action -> (clé de traduction, libellé par défaut, style, emoji)
+TICKET_BUTTONS = {
+    "claim": ("tickets.ui.button_claim", "Claim", discord.ButtonStyle.primary, "✋"),
+    "close": ("tickets.ui.button_close", "Fermer", discord.ButtonStyle.red, "🔒"),
+    "rename": ("tickets.ui.button_rename", "Renommer", discord.ButtonStyle.secondary, "✏️"),
+    "transcript": ("tickets.ui.button_transcript", "Transcrire", discord.ButtonStyle.blurple, "📄"),
+    "add_member": ("tickets.ui.button_add_member", "Ajouter membre", discord.ButtonStyle.green, "➕"),
+    "remove_member": ("tickets.ui.button_remove_member", "Retirer membre", discord.ButtonStyle.danger, "➖"),
+    "reopen": ("tickets.ui.button_reopen", "Réouvrir", discord.ButtonStyle.green, "🔓"),
+    "delete": ("tickets.ui.button_delete", "Supprimer", discord.ButtonStyle.danger, "🗑️"),
+}
 
-    @discord.ui.button(label=t("tickets.ui.button_claim", "Claim"), style=discord.ButtonStyle.primary, emoji="✋")
-    async def claim_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self.cog.claim_ticket_command(interaction, self.ticket_channel_id)
 
-    @discord.ui.button(label=t("tickets.ui.button_close", "Fermer"), style=discord.ButtonStyle.red, emoji="🔒")
-    async def close_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self.cog.close_ticket_command(interaction, "Fermé par staff")
+class TicketButton(discord.ui.DynamicItem[discord.ui.Button], template=r"ticket:(?P<action>claim|close|rename|transcript|add_member|remove_member|reopen|delete):(?P<channel_id>[0-9]+)"):
+    """Bouton de ticket persistant : l'action et le canal sont encodés dans le custom_id,
+    il suffit donc d'enregistrer la classe une fois via bot.add_dynamic_items."""
 
-    @discord.ui.button(label=t("tickets.ui.button_rename", "Renommer"), style=discord.ButtonStyle.secondary, emoji="✏️")
-    async def rename_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.send_modal(RenameTicketModal(self.cog, self.ticket_channel_id))
+    def __init__(self, action: str, ticket_channel_id: int):
+        key, default, style, emoji = TICKET_BUTTONS[action]
+        super().__init__(
+            discord.ui.Button(
+                label=t(key, default),
+                style=style,
+                emoji=emoji,
+                custom_id=f"ticket:{action}:{ticket_channel_id}"
+            )
+        )
+        self.action = action
+        self.ticket_channel_id = ticket_channel_id
 
-    @discord.ui.button(label=t("tickets.ui.button_transcript", "Transcrire"), style=discord.ButtonStyle.blurple, emoji="📄")
-    async def transcript(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.defer(ephemeral=True)
-        try:
-            messages = []
-            channel = self.cog.bot.get_channel(self.ticket_channel_id)
-            if channel:
-                async for message in channel.history(oldest_first=True):
-                    messages.append(f"[{message.created_at}] {message.author}: {message.content}")
-                
-                transcript = "\n".join(messages)
-                transcript_file = discord.File(
-                    fp=__import__("io").BytesIO(transcript.encode()),
-                    filename=f"transcript-{self.ticket_channel_id}.txt"
-                )
-                await interaction.followup.send(file=transcript_file, ephemeral=True)
-                logging.info(f"Transcription générée pour le ticket {self.ticket_channel_id}")
-            else:
-                await interaction.followup.send(t("tickets.transcript.channel_not_found", "❌ Canal non trouvé"), ephemeral=True)
-        except Exception as e:
-            logging.error(f"Erreur transcription: {e}")
-            await interaction.followup.send(t("tickets.transcript.generic_error", "❌ Erreur: {error}", error=str(e)), ephemeral=True)
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(match["action"], int(match["channel_id"]))
+
+    async def callback(self, interaction: discord.Interaction):
+        cog: "TicketsCog" = interaction.client.get_cog("TicketsCog")
+        if cog is None:
+            return
 
-    @discord.ui.button(label=t("tickets.ui.button_add_member", "Ajouter membre"), style=discord.ButtonStyle.green, emoji="➕")
-    async def add_member(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.send_modal(AddMemberModal(self.cog, self.ticket_channel_id))
+        if self.action == "claim":
+            await cog.claim_ticket_command(interaction, self.ticket_channel_id)
+        elif self.action == "close":
+            await cog.close_ticket_command(interaction, "Fermé par staff")
+        elif self.action == "rename":
+            await interaction.response.send_modal(RenameTicketModal(cog, self.ticket_channel_id))
+        elif self.action == "transcript":
+            await cog.send_transcript(interaction, self.ticket_channel_id)
+        elif self.action == "add_member":
+            await interaction.response.send_modal(AddMemberModal(cog, self.ticket_channel_id))
+        elif self.action == "remove_member":
+            await interaction.response.send_modal(RemoveMemberModal(cog, self.ticket_channel_id))
+        elif self.action == "reopen":
+            await cog.reopen_ticket_command(interaction, self.ticket_channel_id)
+        elif self.action == "delete":
+            await cog.delete_ticket_command(interaction, self.ticket_channel_id)
 
-    @discord.ui.button(label=t("tickets.ui.button_remove_member", "Retirer membre"), style=discord.ButtonStyle.danger, emoji="➖")
-    async def remove_member(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await interaction.response.send_modal(RemoveMemberModal(self.cog, self.ticket_channel_id))
 
+class TicketActionView(discord.ui.View):
+    ACTIONS = ("claim", "close", "rename", "transcript", "add_member", "remove_member")
 
-class ClosedTicketView(discord.ui.View):
     def __init__(self, cog: "TicketsCog", ticket_channel_id: int):
         super().__init__(timeout=None)
         self.cog = cog
         self.ticket_channel_id = ticket_channel_id
+        for action in self.ACTIONS:
+            self.add_item(TicketButton(action, ticket_channel_id))
 
-    @discord.ui.button(label=t("tickets.ui.button_reopen", "Réouvrir"), style=discord.ButtonStyle.green, emoji="🔓")
-    async def reopen_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self.cog.reopen_ticket_command(interaction, self.ticket_channel_id)
 
-    @discord.ui.button(label=t("tickets.ui.button_delete", "Supprimer"), style=discord.ButtonStyle.danger, emoji="🗑️")
-    async def delete_ticket(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self.cog.delete_ticket_command(interaction, self.ticket_channel_id)
+class ClosedTicketView(discord.ui.View):
+    ACTIONS = ("reopen", "delete")
+
+    def __init__(self, cog: "TicketsCog", ticket_channel_id: int):
+        super().__init__(timeout=None)
+        self.cog = cog
+        self.ticket_channel_id = ticket_channel_id
+        for action in self.ACTIONS:
+            self.add_item(TicketButton(action, ticket_channel_id))
 
 
 class RenameTicketModal(discord.ui.Modal):
@@ -153,74 +163,178 @@ class RemoveMemberModal(discord.ui.Modal):
         await self.cog.remove_member_from_ticket(interaction, self.ticket_channel_id, self.member_input.value)
 
 
+CLOSED_PREFIX = "fermé-"
+ARCHIVE_BATCH_SIZE = 50  # Tickets archivés au maximum par passage du job de rétention
+ARCHIVE_PACING = 2  # Secondes d'attente après chaque suppression de canal, par worker
+
+
 class TicketsCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
         self.ticket_manager = TicketManager(bot)
         self.logger = logging.getLogger("TicketsCog")
-        self.user_ping_cooldown = {}
+        # Auto-ping : dernier ping par ticket (time.monotonic) et compteurs des pings envoyés/supprimés
+        self.user_ping_cooldown: Dict[int, float] = {}
+        self.ping_counters = {"sent": 0, "suppressed": 0}
+        self._reported_ping_counters = dict(self.ping_counters)
+        self.transcript_store = TranscriptStore(getattr(Config, "TicketTranscriptDir", "data/transcripts"))
+        self.renamer = ChannelRenamer()
+        self.ticket_creations: Dict[Tuple[int, int], asyncio.Future] = {}
+        self.ticket_types = TicketTypeRegistry(Config.TicketTypes)
+        self.category_placer = CategoryPlacer(self.ticket_types)
+        self.channel_pool = ChannelPool(self.ticket_types, self.category_placer)
     
-    async def send_ticket_log(self, log_type: str, embed: discord.Embed):
-        if log_type in Config.Logs and Config.Logs[log_type]["enabled"]:
-            channel_id = Config.Logs[log_type]["channel_id"]
+    async def get_log_channel(self, log_type: str) -> Optional[discord.abc.Messageable]:
+        """Canal du log s'il est activé et accessible, sinon None."""
+        log_config = getattr(Config, "Logs", {}).get(log_type)
+        if not log_config or not log_config.get("enabled"):
+            return None
+        channel_id = log_config["channel_id"]
+        channel = self.bot.get_channel(channel_id)
+        if not channel:
             try:
-                channel = self.bot.get_channel(channel_id)
-                if not channel:
-                    try:
-                        channel = await self.bot.fetch_channel(channel_id)
-                    except Exception:
-                        self.logger.warning(f"Canal de log {channel_id} non trouvé")
-                        return
-                
-                if channel:
-                    await channel.send(embed=embed)
-            except discord.Forbidden:
-                self.logger.warning(f"Permissions insuffisantes pour envoyer un log dans {channel_id}")
-            except discord.NotFound:
-                self.logger.warning(f"Canal de log {channel_id} introuvable")
-            except Exception as e:
-                self.logger.error(f"Erreur lors de l'envoi du log {log_type}: {str(e)}")
+                channel = await self.bot.fetch_channel(channel_id)
+            except Exception:
+                self.logger.warning(f"Canal de log {channel_id} non trouvé")
+                return None
+        return channel
+
+    async def send_ticket_log(self, log_type: str, embed: discord.Embed, file: Optional[discord.File] = None,
+                              channel: Optional[discord.abc.Messageable] = None) -> bool:
+        """Retourne True si le log a bien été envoyé."""
+        if channel is None:
+            channel = await self.get_log_channel(log_type)
+            if channel is None:
+                return False
+        try:
+            await channel.send(embed=embed, file=file)
+            return True
+        except discord.Forbidden:
+            self.logger.warning(f"Permissions insuffisantes pour envoyer un log dans {channel.id}")
+        except discord.NotFound:
+            self.logger.warning(f"Canal de log {channel.id} introuvable")
+        except Exception as e:
+            self.logger.error(f"Erreur lors de l'envoi du log {log_type}: {str(e)}")
+        return False
         
     async def cog_load(self):
+        self.ticket_types.refresh(Config.TicketTypes)
+        await async_db.migrate_ticket_members()
+        await async_db.add_column_if_missing("tickets", "autoclose_at", "TIMESTAMP NULL DEFAULT NULL")
+        await async_db.add_column_if_missing("tickets", "archived_at", "TIMESTAMP NULL DEFAULT NULL")
         for guild in self.bot.guilds:
             await self.ticket_manager.load_from_db(str(guild.id))
+        self.ticket_manager.start_activity_flush()
+        self.ticket_manager.restore_autoclose_schedule(Config.TicketAutoCloseDelay)
+        self.ticket_manager.autoclose_scheduler.start(self.autoclose_ticket)
+        if not self.flush_transcripts.is_running():
+            self.flush_transcripts.start()
+        if not self.report_ping_counters.is_running():
+            self.report_ping_counters.start()
+        if getattr(Config, "TicketArchiveAfter", 0) and not self.archive_closed_tickets.is_running():
+            self.archive_closed_tickets.start()
+        guild = self.bot.get_guild(Config.ServerID)
+        if guild:
+            self.category_placer.load(guild)
+            self.channel_pool.start(guild)
         
-        await self.restore_ticket_views()
         await self.restore_ticket_panel()
         self.logger.info("Système de tickets initialisé")
     
-    async def restore_ticket_views(self):
+    async def send_transcript(self, interaction: discord.Interaction, channel_id: int, fmt: Optional[str] = None, compress: Optional[bool] = None):
+        await interaction.response.defer(ephemeral=True)
+        fmt = fmt or getattr(Config, "TicketTranscriptFormat", "txt")
+        compress = getattr(Config, "TicketTranscriptCompress", False) if compress is None else compress
+        progress_message = None
         try:
-            for channel_id, ticket in self.ticket_manager.tickets.items():
-                try:
-                    channel = self.bot.get_channel(channel_id)
-                    if not channel:
-                        continue
-                    
-                    async for message in channel.history(limit=10):
-                        if message.embeds:
-                            embed = message.embeds[0]
-                            if "Ticket:" in embed.title or "🎫" in embed.title:
-                                if ticket.is_closed:
-                                    await message.edit(view=ClosedTicketView(self, channel_id))
-                                else:
-                                    await message.edit(view=TicketActionView(self, channel_id))
-                                break
-                except discord.NotFound:
-                    # Le message ou le canal n'existe plus
-                    pass
-                except Exception as e:
-                    self.logger.error(f"Erreur restauration vue pour ticket {channel_id}: {e}")
+            channel = self.bot.get_channel(channel_id)
+            if not channel:
+                await interaction.followup.send(t("tickets.transcript.channel_not_found", "❌ Canal non trouvé"), ephemeral=True)
+                return
+
+            async def report_progress(count: int):
+                nonlocal progress_message
+                content = t("tickets.transcript.in_progress", "⏳ Transcription en cours... {count} messages", count=count)
+                if progress_message is None:
+                    progress_message = await interaction.followup.send(content, ephemeral=True, wait=True)
+                else:
+                    await progress_message.edit(content=content)
+
+            async def reply(content: Optional[str] = None, file: Optional[discord.File] = None):
+                # Le message de progression est remplacé par le résultat plutôt que laissé en plan
+                if progress_message is not None:
+                    await progress_message.edit(content=content, attachments=[file] if file else [])
+                elif file:
+                    await interaction.followup.send(content, file=file, ephemeral=True)
+                else:
+                    await interaction.followup.send(content, ephemeral=True)
+
+            result = await self.transcript_store.build_transcript(channel_id, transcript_title(channel), fmt, compress)
+            if result is None:
+                # Ticket ouvert avant la capture en direct : relecture de l'historique
+                result = await write_channel_transcript(channel, fmt, compress, progress=report_progress)
+            writer, transcript, size = result
+            try:
+                if interaction.guild and size > interaction.guild.filesize_limit:
+                    await reply(t("tickets.transcript.too_large", "❌ Transcription trop volumineuse ({size} Mo), essayez avec la compression", size=round(size / 1024 / 1024, 1)))
+                    return
+                transcript_file = discord.File(fp=transcript, filename=f"transcript-{channel_id}.{writer.extension}")
+                await reply(file=transcript_file)
+            finally:
+                writer.close()
+            self.logger.info(f"Transcription générée pour le ticket {channel_id} ({writer.count} messages, {fmt})")
         except Exception as e:
-            self.logger.error(f"Erreur restauration vues: {e}")
-    
+            self.logger.error(f"Erreur transcription: {e}")
+            content = t("tickets.transcript.generic_error", "❌ Erreur: {error}", error=str(e))
+            if progress_message is not None:
+                await progress_message.edit(content=content)
+            else:
+                await interaction.followup.send(content, ephemeral=True)
+
+    @app_commands.command(name="ticket_transcript", description=t("tickets.commands.transcript_description", "Génère la transcription du ticket"))
+    @app_commands.describe(format="Format de la transcription", compress="Compresser en gzip")
+    @app_commands.choices(format=[
+        app_commands.Choice(name="Texte", value="txt"),
+        app_commands.Choice(name="HTML", value="html"),
+        app_commands.Choice(name="NDJSON", value="ndjson"),
+    ])
+    async def ticket_transcript(self, interaction: discord.Interaction, format: Optional[str] = None, compress: Optional[bool] = None):
+        ticket = await self.ticket_manager.lookup_ticket(interaction.channel.id)
+        if not ticket:
+            await interaction.response.send_message(t("tickets.claim.not_ticket_channel", "❌ Ce n'est pas un canal de ticket"), ephemeral=True)
+            return
+        if not self.can_manage_ticket(interaction, ticket):
+            await interaction.response.send_message(t("tickets.claim.no_permission", "❌ Vous n'avez pas la permission"), ephemeral=True)
+            return
+        await self.send_transcript(interaction, interaction.channel.id, format, compress)
+
+    @commands.Cog.listener()
+    async def on_interaction(self, interaction: discord.Interaction):
+        # Les messages de ticket envoyés avant les boutons persistants portent des custom_id
+        # aléatoires : on les remplace au premier clic plutôt que de parcourir l'historique au démarrage.
+        if interaction.type != discord.InteractionType.component or not interaction.message:
+            return
+        custom_id = (interaction.data or {}).get("custom_id", "")
+        if custom_id.startswith("ticket:") or interaction.message.author.id != self.bot.user.id:
+            return
+        ticket = await self.ticket_manager.lookup_ticket(interaction.channel_id)
+        if not ticket:
+            return
+
+        try:
+            view = ClosedTicketView(self, ticket.channel_id) if ticket.is_closed else TicketActionView(self, ticket.channel_id)
+            await interaction.response.edit_message(view=view)
+            await interaction.followup.send(t("tickets.ui.buttons_refreshed", "🔄 Boutons mis à jour, veuillez réessayer."), ephemeral=True)
+        except discord.InteractionResponded:
+            pass
+        except Exception as e:
+            self.logger.error(f"Erreur migration boutons ticket {ticket.channel_id}: {e}")
+
     async def restore_ticket_panel(self):
         try:
-            from modules.Database import db
-            
             for guild in self.bot.guilds:
                 server_id = str(guild.id)
-                panel_message_id = db.get_config(server_id, "ticket_panel_message_id")
+                panel_message_id = await async_db.get_config(server_id, "ticket_panel_message_id")
                 
                 if panel_message_id:
                     try:
@@ -237,22 +351,233 @@ class TicketsCog(commands.Cog):
                             await message.edit(view=TicketTypeSelectView(self))
                             self.logger.info(f"Vue du panel de tickets restaurée pour {guild.id}")
                     except discord.NotFound:
-                        db.set_config(server_id, "ticket_panel_message_id", "")
+                        await async_db.set_config(server_id, "ticket_panel_message_id", "")
                     except Exception as e:
                         self.logger.error(f"Erreur restauration panel pour {guild.id}: {e}")
         except Exception as e:
             self.logger.error(f"Erreur restauration panel: {e}")
 
+    async def archive_transcript(self, channel: discord.TextChannel, closed_by: discord.abc.User, reason: str):
+        log_channel = await self.get_log_channel("ticket_transcript")
+        if log_channel is None:
+            return
+        fmt = getattr(Config, "TicketTranscriptFormat", "txt")
+        compress = getattr(Config, "TicketTranscriptCompress", False)
+        try:
+            # Journal local uniquement : pas de pagination de l'historique à la fermeture
+            result = await self.transcript_store.build_transcript(channel.id, transcript_title(channel), fmt, compress)
+            if result is None:
+                self.logger.info(f"Pas de journal de transcription pour le ticket {channel.id}, archivage ignoré")
+                return
+            writer, transcript, size = result
+            try:
+                if size > channel.guild.filesize_limit:
+                    self.logger.warning(f"Transcription du ticket {channel.id} trop volumineuse pour être archivée ({size} octets)")
+                    return
+                log_embed = discord.Embed(
+                    title="📄 Transcription du Ticket",
+                    description=f"**Canal:** {channel.mention}\n**Fermé par:** {closed_by.mention}",
+                    color=discord.Color.blurple(),
+                    timestamp=datetime.now()
+                )
+                log_embed.add_field(name="Raison", value=reason, inline=False)
+                log_embed.add_field(name="Messages", value=writer.count, inline=True)
+                log_embed.set_footer(text=f"Ticket ID: {channel.id}")
+                transcript_file = discord.File(fp=transcript, filename=f"transcript-{channel.id}.{writer.extension}")
+                await self.send_ticket_log("ticket_transcript", log_embed, file=transcript_file, channel=log_channel)
+            finally:
+                writer.close()
+        except Exception as e:
+            self.logger.error(f"Erreur archivage transcription ticket {channel.id}: {e}")
+
+    @tasks.loop(seconds=2)
+    async def flush_transcripts(self):
+        try:
+            await self.transcript_store.flush()
+        except Exception as e:
+            self.logger.error(f"Erreur écriture des transcriptions: {e}")
+
+    @tasks.loop(minutes=15)
+    async def report_ping_counters(self):
+        """Journalise les compteurs d'auto-ping quand ils ont bougé depuis le dernier rapport."""
+        if self.ping_counters == self._reported_ping_counters:
+            return
+        sent = self.ping_counters["sent"] - self._reported_ping_counters["sent"]
+        suppressed = self.ping_counters["suppressed"] - self._reported_ping_counters["suppressed"]
+        self._reported_ping_counters = dict(self.ping_counters)
+        self.logger.info(
+            f"Auto-ping: {sent} envoyé(s), {suppressed} regroupé(s) sur les 15 dernières minutes "
+            f"(total: {self.ping_counters['sent']} envoyés, {self.ping_counters['suppressed']} regroupés)"
+        )
+
+    @tasks.loop(minutes=10)
+    async def archive_closed_tickets(self):
+        """Job de rétention : archive puis supprime les tickets fermés depuis plus de TicketArchiveAfter heures."""
+        try:
+            cutoff = datetime.now() - timedelta(hours=Config.TicketArchiveAfter)
+            channel_ids = await async_db.get_tickets_to_archive(str(Config.ServerID), cutoff, ARCHIVE_BATCH_SIZE)
+            if not channel_ids:
+                return
+
+            semaphore = asyncio.Semaphore(getattr(Config, "TicketArchiveConcurrency", 2))
+
+            async def worker(channel_id: int) -> bool:
+                async with semaphore:
+                    archived = await self.archive_ticket(channel_id)
+                    # Étale les suppressions pour rester loin des limites de l'API
+                    await asyncio.sleep(ARCHIVE_PACING)
+                    return archived
+
+            results = await asyncio.gather(*(worker(int(channel_id)) for channel_id in channel_ids))
+            self.logger.info(f"Rétention: {sum(results)}/{len(results)} tickets fermés archivés")
+        except Exception as e:
+            self.logger.error(f"Erreur job de rétention des tickets: {e}")
+
+    async def archive_ticket(self, channel_id: int) -> bool:
+        channel = self.bot.get_channel(channel_id)
+        try:
+            # Le ticket a pu être rouvert pendant que le lot attendait son tour
+            ticket_data = await async_db.get_ticket_by_channel(str(channel_id))
+            if not ticket_data or not ticket_data.get("is_closed"):
+                return False
+            if not await self.save_archived_transcript(channel_id, channel):
+                self.logger.warning(f"Transcription du ticket {channel_id} non sauvegardée, suppression annulée")
+                return False
+            if channel:
+                await channel.delete(reason="Archivage automatique d'un ticket fermé")
+        except discord.NotFound:
+            pass
+        except Exception as e:
+            self.logger.error(f"Erreur archivage ticket {channel_id}: {e}")
+            return False
+
+        await async_db.mark_ticket_archived(str(channel_id))
+        self.ticket_manager.forget_ticket(channel_id)
+        self.renamer.forget(channel_id)
+        self.user_ping_cooldown.pop(channel_id, None)
+        await self.transcript_store.delete(channel_id)
+        return True
+
+    async def save_archived_transcript(self, channel_id: int, channel: Optional[discord.TextChannel]) -> bool:
+        """Envoie la transcription dans le log ticket_archive s'il est actif, sinon (ou en cas
+        d'échec) la garde sur disque. Retourne False si elle n'a pu être conservée nulle part."""
+        fmt = getattr(Config, "TicketTranscriptFormat", "txt")
+        compress = getattr(Config, "TicketTranscriptCompress", False)
+        title = transcript_title(channel) if channel else f"Transcription ({channel_id})"
+        result = await self.transcript_store.build_transcript(channel_id, title, fmt, compress)
+        if result is None:
+            if channel is None:
+                # Canal déjà supprimé et pas de journal : il ne reste rien à conserver
+                self.logger.warning(f"Aucune transcription disponible pour le ticket archivé {channel_id}")
+                return True
+            result = await write_channel_transcript(channel, fmt, compress)
+
+        writer, transcript, size = result
+        try:
+            filename = f"transcript-{channel_id}.{writer.extension}"
+            log_channel = await self.get_log_channel("ticket_archive")
+            if log_channel and channel and size <= channel.guild.filesize_limit:
+                log_embed = discord.Embed(
+                    title="🗄️ Ticket Archivé",
+                    description=f"**Canal:** #{channel.name}",
+                    color=discord.Color.dark_grey(),
+                    timestamp=datetime.now()
+                )
+                log_embed.add_field(name="Messages", value=writer.count, inline=True)
+                log_embed.add_field(name="ID Canal", value=channel_id, inline=True)
+                log_embed.set_footer(text=f"Ticket ID: {channel_id}")
+                if await self.send_ticket_log("ticket_archive", log_embed, file=discord.File(fp=transcript, filename=filename), channel=log_channel):
+                    return True
+                transcript.seek(0)
+            try:
+                path = await self.transcript_store.save_archive(transcript, filename)
+            except OSError as e:
+                self.logger.error(f"Erreur sauvegarde locale de la transcription {channel_id}: {e}")
+                return False
+            self.logger.info(f"Transcription du ticket {channel_id} archivée dans {path}")
+            return True
+        finally:
+            writer.close()
+
+    @commands.Cog.listener()
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent):
+        if not self.ticket_manager.is_journaled(payload.channel_id):
+            return
+        content = payload.data.get("content")
+        if content is None:
+            # Mise à jour sans modification du contenu (ex: chargement d'un embed)
+            return
+        self.transcript_store.append_edit(payload.channel_id, payload.message_id, content, payload.data.get("edited_timestamp"))
+
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent):
+        if self.ticket_manager.is_journaled(payload.channel_id):
+            self.transcript_store.append_delete(payload.channel_id, payload.message_id)
+
+    def ticket_state_changes(self, channel: discord.TextChannel, closed: bool) -> dict:
+        """Calcule les paramètres de channel.edit pour amener le canal dans l'état voulu.
+        Un dictionnaire vide signifie que le canal est déjà dans cet état."""
+        changes = {}
+        overwrites = channel.overwrites
+        overwrites_changed = False
+        for target, overwrite in overwrites.items():
+            if target == channel.guild.default_role:
+                continue
+            if overwrite.send_messages != (not closed):
+                overwrite.send_messages = not closed
+                overwrites_changed = True
+        if overwrites_changed:
+            changes["overwrites"] = overwrites
+
+        # Le nom de référence tient compte d'un éventuel renommage encore en attente
+        name = self.renamer.effective_name(channel)
+        if closed and not name.startswith(CLOSED_PREFIX):
+            changes["name"] = f"{CLOSED_PREFIX}{name}"
+        elif not closed and name.startswith(CLOSED_PREFIX):
+            changes["name"] = name[len(CLOSED_PREFIX):]
+        return changes
+
+    async def apply_ticket_state(self, channel: discord.TextChannel, closed: bool, reason: Optional[str] = None):
+        """Applique l'état fermé/ouvert en un seul appel REST (permissions et nom).
+        Si le quota de renommage est épuisé, le nom est appliqué plus tard par le ChannelRenamer."""
+        changes = self.ticket_state_changes(channel, closed)
+        name = changes.pop("name", None)
+        if name is not None and self.renamer.claim(channel, name):
+            changes["name"] = name
+        if changes:
+            await channel.edit(reason=reason, **changes)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
+        if channel.guild.id == Config.ServerID:
+            self.category_placer.channel_created(channel)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel):
+        if channel.guild.id == Config.ServerID:
+            self.category_placer.channel_deleted(channel)
+        self.channel_pool.discard(channel.id)
+        self.ticket_manager.closed_channel_ids.discard(channel.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        if after.guild.id == Config.ServerID:
+            self.category_placer.channel_moved(before, after)
+
     async def cog_unload(self):
-        for task in self.ticket_manager.autoclose_delays.values():
-            task.cancel()
+        self.channel_pool.stop()
+        self.renamer.stop()
+        self.ticket_manager.autoclose_scheduler.stop()
+        await self.ticket_manager.stop_activity_flush()
+        self.flush_transcripts.cancel()
+        self.report_ping_counters.cancel()
+        self.archive_closed_tickets.cancel()
+        await self.transcript_store.close()
 
     @app_commands.command(name="ticket_panel", description=t("tickets.commands.panel_description", "Envoie le panel d'ouverture de tickets"))
     @app_commands.checks.has_permissions(administrator=True)
     async def ticket_panel(self, interaction: discord.Interaction):
         try:
-            from modules.Database import db
-            
             channel = self.bot.get_channel(Config.TicketChannel) or await self.bot.fetch_channel(Config.TicketChannel)
             if not channel:
                 await interaction.response.send_message(t("tickets.panel.channel_not_found", "❌ TicketChannel non trouvé"), ephemeral=True)
@@ -268,7 +593,7 @@ class TicketsCog(commands.Cog):
             message = await channel.send(embed=embed, view=TicketTypeSelectView(self))
             
             server_id = str(interaction.guild.id)
-            db.set_config(server_id, "ticket_panel_message_id", str(message.id))
+            await async_db.set_config(server_id, "ticket_panel_message_id", str(message.id))
             
             await interaction.response.send_message(t("tickets.panel.sent", "✅ Panel envoyé"), ephemeral=True)
             self.logger.info(f"Panel de tickets envoyé dans {Config.TicketChannel} - Message ID: {message.id}")
@@ -278,24 +603,43 @@ class TicketsCog(commands.Cog):
 
     async def create_ticket_for_user(self, interaction: discord.Interaction, ticket_type_key: str):
         await interaction.response.defer(ephemeral=True)
-        
+
+        # Un seul ticket en cours de création par (serveur, utilisateur) : les clics répétés
+        # attendent la création en cours et reçoivent la même réponse (canal ou erreur).
+        key = (interaction.guild.id, interaction.user.id)
+        pending = self.ticket_creations.get(key)
+        if pending is not None:
+            _, reply = await asyncio.shield(pending)
+            await interaction.followup.send(reply, ephemeral=True)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self.ticket_creations[key] = future
+        ticket_channel = None
+        reply = t("tickets.create.generic_error", "❌ Erreur: {error}", error="création interrompue")
         try:
-            if ticket_type_key not in Config.TicketTypes:
-                await interaction.followup.send(t("tickets.create.invalid_type", "❌ Type de ticket invalide"), ephemeral=True)
-                return
+            ticket_channel, reply = await self.open_ticket(interaction, ticket_type_key)
+        finally:
+            future.set_result((ticket_channel, reply))
+            del self.ticket_creations[key]
+        await interaction.followup.send(reply, ephemeral=True)
+        if ticket_channel:
+            await self.log_ticket_created(interaction, ticket_channel, ticket_type_key)
+
+    async def open_ticket(self, interaction: discord.Interaction, ticket_type_key: str) -> Tuple[Optional[discord.TextChannel], str]:
+        """Crée le ticket et retourne (canal ou None, réponse à envoyer à l'utilisateur)."""
+        try:
+            ticket_type = self.ticket_types.get(ticket_type_key)
+            if ticket_type is None:
+                return None, t("tickets.create.invalid_type", "❌ Type de ticket invalide")
 
-            ticket_type = Config.TicketTypes[ticket_type_key]
             guild = interaction.guild
-            category_id = ticket_type.get("category_id")
-
-            category = guild.get_channel(category_id) or await guild.fetch_channel(category_id)
-            if not isinstance(category, discord.CategoryChannel):
-                self.logger.error(f"Catégorie {category_id} invalide pour type {ticket_type_key}")
-                await interaction.followup.send(t("tickets.create.category_not_found", "❌ Catégorie de ticket non trouvée"), ephemeral=True)
-                return
 
-            user_tickets = self.ticket_manager.get_user_open_tickets(str(guild.id), interaction.user.id)
-            ticket_number = len(user_tickets) + 1
+            user_tickets = await self.ticket_manager.get_user_open_tickets(str(guild.id), interaction.user.id)
+            max_open = getattr(Config, "TicketMaxOpenPerUser", 0)
+            if max_open and len(user_tickets) >= max_open:
+                channels = " ".join(f"<#{ticket.channel_id}>" for ticket in user_tickets)
+                return None, t("tickets.create.limit_reached", "❌ Vous avez déjà {count} ticket(s) ouvert(s): {channels}", count=len(user_tickets), channels=channels)
             
             channel_name = f"ticket-{interaction.user.name}".lower()[:100]
 
@@ -308,7 +652,7 @@ class TicketsCog(commands.Cog):
                 )
             }
 
-            for staff_role_id in ticket_type.get("staff_roles_id", []):
+            for staff_role_id in ticket_type.staff_role_ids:
                 staff_role = guild.get_role(staff_role_id)
                 if staff_role:
                     overwrites[staff_role] = discord.PermissionOverwrite(
@@ -317,24 +661,42 @@ class TicketsCog(commands.Cog):
                         read_message_history=True
                     )
 
-            ticket_channel = await category.create_text_channel(
-                name=channel_name,
-                overwrites=overwrites
-            )
-
-            self.ticket_manager.create_ticket(
+            ticket_channel = await self.claim_pooled_channel(guild, ticket_type_key, channel_name, overwrites)
+            if ticket_channel is None:
+                category = await self.category_placer.place(guild, ticket_type_key)
+                if category is None:
+                    self.logger.error(f"Aucune catégorie disponible pour type {ticket_type_key}")
+                    return None, t("tickets.create.category_not_found", "❌ Catégorie de ticket non trouvée")
+                self.category_placer.reserve(category.id)
+                try:
+                    ticket_channel = await category.create_text_channel(
+                        name=channel_name,
+                        overwrites=overwrites
+                    )
+                finally:
+                    self.category_placer.release(category.id)
+            ticket = await self.ticket_manager.create_ticket(
                 server_id=str(guild.id),
                 channel_id=ticket_channel.id,
                 owner_id=interaction.user.id,
                 type_key=ticket_type_key
             )
+            if ticket is None:
+                # Sans ligne en BDD le ticket serait invisible pour toutes les commandes : on retire le canal
+                self.logger.error(f"Enregistrement du ticket {ticket_channel.id} impossible, suppression du canal")
+                try:
+                    await ticket_channel.delete(reason="Échec de l'enregistrement du ticket")
+                except Exception as e:
+                    self.logger.error(f"Erreur suppression canal {ticket_channel.id}: {e}")
+                return None, t("tickets.create.save_failed", "❌ Impossible d'enregistrer le ticket, réessayez plus tard")
+            self.transcript_store.start(ticket_channel.id)
 
             embed = discord.Embed(
-                title=t("tickets.create.embed_title", "🎫 Ticket: {type}", type=ticket_type['name']),
+                title=t("tickets.create.embed_title", "🎫 Ticket: {type}", type=ticket_type.name),
                 description=t("tickets.create.embed_description", "Merci d'avoir ouvert un ticket. Le staff vous répondra bientôt."),
                 color=discord.Color.green()
             )
-            embed.add_field(name=t("tickets.create.type_field", "Type"), value=ticket_type["name"], inline=True)
+            embed.add_field(name=t("tickets.create.type_field", "Type"), value=ticket_type.name, inline=True)
             embed.add_field(name=t("tickets.create.author_field", "Auteur"), value=interaction.user.mention, inline=True)
             embed.add_field(name=t("tickets.create.created_at_field", "Créé à"), value=f"<t:{int(datetime.now().timestamp())}:F>", inline=False)
             embed.add_field(
@@ -345,9 +707,9 @@ class TicketsCog(commands.Cog):
             embed.set_footer(text=t("tickets.create.footer", "Ticket ID: {ticket_id}", ticket_id=ticket_channel.id))
 
             ping_text = ""
-            if ticket_type.get("roles_to_ping"):
+            if ticket_type.ping_role_ids:
                 roles_mentions = []
-                for role_id in ticket_type["roles_to_ping"]:
+                for role_id in ticket_type.ping_role_ids:
                     role = guild.get_role(role_id)
                     if role:
                         roles_mentions.append(role.mention)
@@ -357,36 +719,52 @@ class TicketsCog(commands.Cog):
             message_content = f"{ping_text}\n" if ping_text else ""
             message = await ticket_channel.send(content=message_content, embed=embed, view=TicketActionView(self, ticket_channel.id))
 
-            await interaction.followup.send(
-                t("tickets.create.success", "✅ Ticket créé: {channel}", channel=ticket_channel.mention),
-                ephemeral=True
-            )
             self.logger.info(f"Ticket créé pour {interaction.user} ({interaction.user.id}) - Type: {ticket_type_key} - Canal: {ticket_channel.id}")
-            
-            log_embed = discord.Embed(
-                title="🎫 Ticket Créé",
-                description=f"**Canal:** {ticket_channel.mention}\n**Auteur:** {interaction.user.mention}",
-                color=discord.Color.green(),
-                timestamp=datetime.now()
-            )
-            log_embed.add_field(name="Type", value=ticket_type['name'], inline=True)
-            log_embed.add_field(name="ID Canal", value=ticket_channel.id, inline=True)
-            log_embed.add_field(name="ID Utilisateur", value=interaction.user.id, inline=True)
-            log_embed.set_footer(text=f"Ticket ID: {ticket_channel.id}")
-            await self.send_ticket_log("ticket_create", log_embed)
+            return ticket_channel, t("tickets.create.success", "✅ Ticket créé: {channel}", channel=ticket_channel.mention)
 
         except discord.Forbidden:
             self.logger.error("Permissions insuffisantes pour créer le canal")
-            await interaction.followup.send(t("tickets.create.missing_permissions", "❌ Permissions insuffisantes"), ephemeral=True)
+            return None, t("tickets.create.missing_permissions", "❌ Permissions insuffisantes")
         except Exception as e:
             self.logger.error(f"Erreur création ticket: {e}")
-            await interaction.followup.send(t("tickets.create.generic_error", "❌ Erreur: {error}", error=str(e)), ephemeral=True)
+            return None, t("tickets.create.generic_error", "❌ Erreur: {error}", error=str(e))
+
+    async def log_ticket_created(self, interaction: discord.Interaction, ticket_channel: discord.TextChannel, ticket_type_key: str):
+        ticket_type = self.ticket_types.get(ticket_type_key)
+        log_embed = discord.Embed(
+            title="🎫 Ticket Créé",
+            description=f"**Canal:** {ticket_channel.mention}\n**Auteur:** {interaction.user.mention}",
+            color=discord.Color.green(),
+            timestamp=datetime.now()
+        )
+        log_embed.add_field(name="Type", value=ticket_type.name if ticket_type else ticket_type_key, inline=True)
+        log_embed.add_field(name="ID Canal", value=ticket_channel.id, inline=True)
+        log_embed.add_field(name="ID Utilisateur", value=interaction.user.id, inline=True)
+        log_embed.set_footer(text=f"Ticket ID: {ticket_channel.id}")
+        await self.send_ticket_log("ticket_create", log_embed)
+
+    async def claim_pooled_channel(self, guild: discord.Guild, type_key: str, name: str, overwrites: dict) -> Optional[discord.TextChannel]:
+        """Transforme un canal de la réserve en ticket en un seul edit (None si la réserve est vide)."""
+        channel = self.channel_pool.acquire(guild, type_key)
+        if channel is None:
+            return None
+        try:
+            changes = {"overwrites": overwrites, "topic": None}
+            # Sans créneau de renommage libre, le renamer applique le nom plus tard
+            if self.renamer.claim(channel, name):
+                changes["name"] = name
+            await channel.edit(**changes)
+            return channel
+        except Exception as e:
+            # Le canal garde son topic de réserve et sera récupéré au prochain démarrage
+            self.logger.error(f"Erreur utilisation canal de réserve {channel.id}: {e}")
+            return None
 
     async def claim_ticket_command(self, interaction: discord.Interaction, channel_id: int):
         await interaction.response.defer(ephemeral=True)
         
         try:
-            ticket = self.ticket_manager.get_ticket(channel_id)
+            ticket = await self.ticket_manager.get_ticket(channel_id)
             if not ticket:
                 await interaction.followup.send("❌ Ce n'est pas un canal de ticket", ephemeral=True)
                 return
@@ -404,7 +782,7 @@ class TicketsCog(commands.Cog):
                 )
                 return
 
-            self.ticket_manager.claim_ticket(channel_id, interaction.user.id)
+            await self.ticket_manager.claim_ticket(channel_id, interaction.user.id)
 
             channel = self.bot.get_channel(channel_id)
             if channel:
@@ -437,7 +815,7 @@ class TicketsCog(commands.Cog):
         await interaction.response.defer(ephemeral=True)
         
         try:
-            ticket = self.ticket_manager.get_ticket(channel_id)
+            ticket = await self.ticket_manager.get_ticket(channel_id)
             if not ticket:
                 await interaction.followup.send("❌ Ce n'est pas un canal de ticket", ephemeral=True)
                 return
@@ -454,9 +832,16 @@ class TicketsCog(commands.Cog):
             channel = self.bot.get_channel(channel_id)
             if channel:
                 old_name = channel.name
-                await channel.edit(name=new_name)
-                await interaction.followup.send(f"✅ Ticket renommé en `{new_name}`", ephemeral=True)
-                self.logger.info(f"Ticket {channel_id} renommé en {new_name}")
+                result = await self.renamer.rename(channel, new_name)
+                if result is RenameResult.UNCHANGED:
+                    await interaction.followup.send(t("tickets.rename.unchanged", "ℹ️ Le ticket s'appelle déjà `{name}`", name=new_name), ephemeral=True)
+                    return
+                if result is RenameResult.APPLIED:
+                    await interaction.followup.send(f"✅ Ticket renommé en `{new_name}`", ephemeral=True)
+                    self.logger.info(f"Ticket {channel_id} renommé en {new_name}")
+                else:
+                    await interaction.followup.send(self.rename_queued_message(channel_id, new_name), ephemeral=True)
+                    self.logger.info(f"Ticket {channel_id}: renommage en {new_name} mis en attente")
                 
                 log_embed = discord.Embed(
                     title="✏️ Ticket Renommé",
@@ -482,11 +867,10 @@ class TicketsCog(commands.Cog):
         await interaction.response.defer(ephemeral=True)
         
         try:
-            ticket = self.ticket_manager.get_ticket(channel_id)
+            ticket = await self.ticket_manager.get_ticket(channel_id)
             if not ticket:
-                from modules.Database import db
-                ticket_data = db.get_ticket_by_channel(str(channel_id))
-                if not ticket_data or not ticket_data.get("is_closed"):
+                ticket = await self.ticket_manager.lookup_ticket(channel_id)
+                if not ticket or not ticket.is_closed:
                     await interaction.followup.send("❌ Ticket non trouvé ou non fermé", ephemeral=True)
                     return
             else:
@@ -503,7 +887,10 @@ class TicketsCog(commands.Cog):
             if channel:
                 await channel.delete()
             
-            self.ticket_manager.delete_ticket(channel_id)
+            await self.ticket_manager.delete_ticket(channel_id)
+            await self.transcript_store.delete(channel_id)
+            self.renamer.forget(channel_id)
+            self.user_ping_cooldown.pop(channel_id, None)
             
             log_embed = discord.Embed(
                 title="🗑️ Ticket Supprimé",
@@ -536,7 +923,7 @@ class TicketsCog(commands.Cog):
         
         try:
             channel = interaction.channel
-            ticket = self.ticket_manager.get_ticket(channel.id)
+            ticket = await self.ticket_manager.get_ticket(channel.id)
 
             if not ticket:
                 await interaction.followup.send("❌ Ce n'est pas un canal de ticket", ephemeral=True)
@@ -547,9 +934,7 @@ class TicketsCog(commands.Cog):
                 await interaction.followup.send("❌ Vous n'avez pas la permission", ephemeral=True)
                 return
 
-            self.ticket_manager.cancel_autoclose_task(channel.id)
-
-            self.ticket_manager.close_ticket(channel.id, interaction.user.id, reason)
+            await self.ticket_manager.close_ticket(channel.id, interaction.user.id, reason)
 
             embed = discord.Embed(
                 title="🔒 Ticket Fermé",
@@ -565,18 +950,11 @@ class TicketsCog(commands.Cog):
             )
 
             await channel.send(embed=embed, view=ClosedTicketView(self, channel.id))
-
-            overwrites = channel.overwrites
-            for target, overwrite in overwrites.items():
-                if target != channel.guild.default_role:
-                    overwrite.send_messages = False
-                    await channel.set_permissions(target, overwrite=overwrite)
-
-            if not channel.name.startswith("fermé-"):
-                await channel.edit(name=f"fermé-{channel.name}")
+            await self.apply_ticket_state(channel, closed=True, reason=reason)
 
             await interaction.followup.send("✅ Ticket fermé", ephemeral=True)
             self.logger.info(f"Ticket {channel.id} fermé par {interaction.user} - Raison: {reason}")
+            await self.archive_transcript(channel, interaction.user, reason)
             
             log_embed = discord.Embed(
                 title="🔒 Ticket Fermé",
@@ -607,7 +985,7 @@ class TicketsCog(commands.Cog):
                 await interaction.followup.send("❌ Canal non trouvé", ephemeral=True)
                 return
 
-            ticket = self.ticket_manager.get_ticket(channel_id)
+            ticket = await self.ticket_manager.get_ticket(channel_id)
             if not ticket:
                 await interaction.followup.send("❌ Ce n'est pas un canal de ticket", ephemeral=True)
                 return
@@ -630,7 +1008,7 @@ class TicketsCog(commands.Cog):
                     send_messages=True,
                     read_message_history=True
                 )
-                self.ticket_manager.add_ticket_member(channel_id, member.id)
+                await self.ticket_manager.add_ticket_member(channel_id, member.id)
                 await interaction.followup.send(f"✅ {member.mention} ajouté au ticket", ephemeral=True)
                 self.logger.info(f"Membre {member} ajouté au ticket {channel_id}")
                 
@@ -665,7 +1043,7 @@ class TicketsCog(commands.Cog):
                 await interaction.followup.send("❌ Canal non trouvé", ephemeral=True)
                 return
 
-            ticket = self.ticket_manager.get_ticket(channel_id)
+            ticket = await self.ticket_manager.get_ticket(channel_id)
             if not ticket:
                 await interaction.followup.send("❌ Ce n'est pas un canal de ticket", ephemeral=True)
                 return
@@ -685,7 +1063,7 @@ class TicketsCog(commands.Cog):
 
             try:
                 await channel.set_permissions(member, overwrite=None)
-                self.ticket_manager.remove_ticket_member(channel_id, member.id)
+                await self.ticket_manager.remove_ticket_member(channel_id, member.id)
                 await interaction.followup.send(f"✅ {member.mention} retiré du ticket", ephemeral=True)
                 self.logger.info(f"Membre {member} retiré du ticket {channel_id}")
                 
@@ -706,6 +1084,54 @@ class TicketsCog(commands.Cog):
             self.logger.error(f"Erreur retrait membre: {e}")
             await interaction.followup.send(f"❌ Erreur: {str(e)}", ephemeral=True)
 
+    def rename_queued_message(self, channel_id: int, name: str) -> str:
+        pending = self.renamer.get_pending(channel_id)
+        eta = int(datetime.now().timestamp() + (pending[1] if pending else 0))
+        return t("tickets.rename.queued", "⏳ Limite de renommage atteinte, le ticket sera renommé en `{name}` <t:{eta}:R>", name=name, eta=eta)
+
+    @app_commands.command(name="ticket_status", description=t("tickets.commands.status_description", "Affiche l'état du ticket"))
+    async def ticket_status(self, interaction: discord.Interaction):
+        ticket = await self.ticket_manager.lookup_ticket(interaction.channel.id)
+        if not ticket:
+            await interaction.response.send_message(t("tickets.claim.not_ticket_channel", "❌ Ce n'est pas un canal de ticket"), ephemeral=True)
+            return
+
+        ticket_type = self.ticket_types.get(ticket.type_key)
+        embed = discord.Embed(
+            title=t("tickets.status.title", "📋 État du ticket"),
+            color=discord.Color.red() if ticket.is_closed else discord.Color.green()
+        )
+        embed.add_field(name=t("tickets.create.type_field", "Type"), value=ticket_type.name if ticket_type else ticket.type_key, inline=True)
+        embed.add_field(name=t("tickets.create.author_field", "Auteur"), value=f"<@{ticket.owner_id}>", inline=True)
+        embed.add_field(
+            name=t("tickets.status.state_field", "État"),
+            value=t("tickets.status.closed", "Fermé") if ticket.is_closed else t("tickets.status.open", "Ouvert"),
+            inline=True
+        )
+        if ticket.claimed_by_id:
+            workload = len(self.ticket_manager.get_claimed_tickets(ticket.claimed_by_id, ticket.server_id))
+            claimed_value = t("tickets.status.claimed_value", "<@{staff_id}> ({count} ticket(s) ouvert(s))", staff_id=ticket.claimed_by_id, count=workload)
+        else:
+            claimed_value = t("tickets.status.none", "Personne")
+        embed.add_field(name=t("tickets.status.claimed_field", "Pris en charge par"), value=claimed_value, inline=True)
+        embed.add_field(name=t("tickets.status.members_field", "Membres"), value=len(ticket.members), inline=True)
+        embed.add_field(name=t("tickets.create.created_at_field", "Créé à"), value=f"<t:{int(ticket.created_at.timestamp())}:F>", inline=False)
+
+        deadline = self.ticket_manager.get_autoclose_deadline(ticket.channel_id)
+        if deadline:
+            embed.add_field(name=t("tickets.status.autoclose_field", "Fermeture automatique"), value=f"<t:{int(deadline.timestamp())}:R>", inline=False)
+
+        pending = self.renamer.get_pending(ticket.channel_id)
+        if pending:
+            name, delay = pending
+            embed.add_field(
+                name=t("tickets.status.pending_rename_field", "Renommage en attente"),
+                value=f"`{name}` <t:{int(datetime.now().timestamp() + delay)}:R>",
+                inline=False
+            )
+        embed.set_footer(text=t("tickets.create.footer", "Ticket ID: {ticket_id}", ticket_id=ticket.channel_id))
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
     @app_commands.command(name="ticket_rename", description=t("tickets.commands.rename_description", "Renomme le ticket"))
     @app_commands.describe(name="Nouveau nom")
     async def ticket_rename(self, interaction: discord.Interaction, name: str):
@@ -713,7 +1139,7 @@ class TicketsCog(commands.Cog):
         
         try:
             channel = interaction.channel
-            ticket = self.ticket_manager.get_ticket(channel.id)
+            ticket = await self.ticket_manager.get_ticket(channel.id)
 
             if not ticket:
                 await interaction.followup.send("❌ Ce n'est pas un canal de ticket", ephemeral=True)
@@ -730,9 +1156,15 @@ class TicketsCog(commands.Cog):
                 return
 
             # Renommer
-            await channel.edit(name=name)
-            await interaction.followup.send(f"✅ Ticket renommé en `{name}`", ephemeral=True)
-            self.logger.info(f"Ticket {channel.id} renommé en {name}")
+            result = await self.renamer.rename(channel, name)
+            if result is RenameResult.UNCHANGED:
+                await interaction.followup.send(t("tickets.rename.unchanged", "ℹ️ Le ticket s'appelle déjà `{name}`", name=name), ephemeral=True)
+            elif result is RenameResult.APPLIED:
+                await interaction.followup.send(f"✅ Ticket renommé en `{name}`", ephemeral=True)
+                self.logger.info(f"Ticket {channel.id} renommé en {name}")
+            else:
+                await interaction.followup.send(self.rename_queued_message(channel.id, name), ephemeral=True)
+                self.logger.info(f"Ticket {channel.id}: renommage en {name} mis en attente")
 
         except discord.Forbidden:
             await interaction.followup.send("❌ Permissions insuffisantes", ephemeral=True)
@@ -742,67 +1174,82 @@ class TicketsCog(commands.Cog):
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
-        if message.author.bot or not message.guild or message.guild.id != Config.ServerID:
+        if not message.guild or message.guild.id != Config.ServerID:
             return
 
-        ticket = self.ticket_manager.get_ticket(message.channel.id)
+        ticket = await self.ticket_manager.get_ticket(message.channel.id)
         if not ticket:
+            # Ticket fermé évincé de la mémoire : le journal doit rester complet pour l'archivage
+            if self.ticket_manager.is_journaled(message.channel.id):
+                self.transcript_store.append_message(message.channel.id, message_to_record(message))
+            return
+
+        # Capture en direct : la transcription n'aura plus à relire l'historique
+        self.transcript_store.append_message(ticket.channel_id, message_to_record(message))
+        if message.author.bot:
             return
 
-        if Config.TicketAutoPingRole:
-            auto_ping_role = message.guild.get_role(Config.TicketAutoPingRole)
-            if auto_ping_role and auto_ping_role in message.author.roles:
-                # Ping une seule fois par message (anti-spam)
-                if message.author.id != ticket.owner_id:  # Ne pas ping si c'est le proprio
-                    owner = message.guild.get_member(ticket.owner_id)
-                    if owner:
-                        try:
-                            ping_message = await message.reply(f"{owner.mention}", allowed_mentions=discord.AllowedMentions(users=True))
-                            await ping_message.delete()
-                            self.logger.info(f"Auto-ping: {message.author} a pingé {owner} dans ticket {message.channel.id}")
-                        except Exception as e:
-                            self.logger.error(f"Erreur auto-ping: {e}")
+        if Config.TicketAutoPingRole and message.author.id != ticket.owner_id:  # Ne pas ping si c'est le proprio
+            if message.author.get_role(Config.TicketAutoPingRole):
+                await self.auto_ping_owner(message, ticket)
 
         try:
-            ticket_type = Config.TicketTypes.get(ticket.type_key, {})
-            staff_roles = ticket_type.get("staff_roles_id", [])
-            is_staff = any(role.id in staff_roles for role in message.author.roles)
-
-            if is_staff:
+            if self.ticket_types.is_staff(message.author, ticket.type_key):
                 self.ticket_manager.update_staff_message_time(message.channel.id)
                 
-                if not self.ticket_manager.get_autoclose_task(message.channel.id):
-                    task = asyncio.create_task(
-                        self.autoclose_ticket_task(
-                            message.channel.id,
-                            Config.TicketAutoCloseDelay
-                        )
-                    )
-                    self.ticket_manager.set_autoclose_task(message.channel.id, task)
+                if not self.ticket_manager.get_autoclose_deadline(message.channel.id):
+                    deadline = datetime.now() + timedelta(hours=Config.TicketAutoCloseDelay)
+                    await self.ticket_manager.schedule_autoclose(message.channel.id, deadline)
                     self.logger.info(f"Timer auto-close démarré pour ticket {message.channel.id}")
 
             elif message.author.id == ticket.owner_id:
                 self.ticket_manager.update_owner_message_time(message.channel.id)
-                self.ticket_manager.cancel_autoclose_task(message.channel.id)
-                self.logger.info(f"Timer auto-close annulé (propriétaire a répondu) pour ticket {message.channel.id}")
+                if await self.ticket_manager.cancel_autoclose(message.channel.id):
+                    self.logger.info(f"Timer auto-close annulé (propriétaire a répondu) pour ticket {message.channel.id}")
 
         except Exception as e:
             self.logger.error(f"Erreur gestion auto-close: {e}")
 
-    async def autoclose_ticket_task(self, channel_id: int, delay_hours: int):
+    async def auto_ping_owner(self, message: discord.Message, ticket):
+        """Un seul ping du propriétaire par fenêtre TicketAutoPingCooldown : une rafale de
+        messages du staff ne produit qu'une notification, les suivantes sont comptées."""
+        now = time.monotonic()
+        last_ping = self.user_ping_cooldown.get(ticket.channel_id)
+        if last_ping is not None and now - last_ping < getattr(Config, "TicketAutoPingCooldown", 300):
+            self.ping_counters["suppressed"] += 1
+            return
+
+        owner = message.guild.get_member(ticket.owner_id)
+        if not owner:
+            return
+        self.user_ping_cooldown[ticket.channel_id] = now
         try:
-            await asyncio.sleep(delay_hours * 3600)
+            await message.channel.send(
+                t("tickets.autoping.message", "🔔 {owner}, le staff vous a répondu", owner=owner.mention),
+                allowed_mentions=discord.AllowedMentions(users=[owner], roles=False, everyone=False)
+            )
+            self.ping_counters["sent"] += 1
+            self.logger.info(f"Auto-ping: {message.author} a pingé {owner} dans ticket {message.channel.id}")
+        except Exception as e:
+            self.logger.error(f"Erreur auto-ping: {e}")
 
-            ticket = self.ticket_manager.get_ticket(channel_id)
-            if not ticket:
+    async def autoclose_ticket(self, channel_id: int):
+        delay_hours = Config.TicketAutoCloseDelay
+        try:
+            ticket = await self.ticket_manager.get_ticket(channel_id)
+            if not ticket or ticket.is_closed:
+                await self.ticket_manager.clear_autoclose(channel_id)
                 return
 
-            if ticket.last_owner_message > ticket.last_staff_message:
+            if ticket.last_staff_message and ticket.last_owner_message and ticket.last_owner_message > ticket.last_staff_message:
+                await self.ticket_manager.clear_autoclose(channel_id)
                 return
 
             channel = self.bot.get_channel(channel_id)
-            if channel:
-                self.ticket_manager.close_ticket(channel_id, self.bot.user.id, f"Inactivité ({delay_hours}h sans réponse)")
+            if not channel:
+                await self.ticket_manager.clear_autoclose(channel_id)
+            else:
+                await self.ticket_manager.close_ticket(channel_id, self.bot.user.id, f"Inactivité ({delay_hours}h sans réponse)")
 
                 embed = discord.Embed(
                     title="🔒 Ticket Fermé Automatiquement",
@@ -822,15 +1269,7 @@ class TicketsCog(commands.Cog):
 
                 try:
                     await channel.send(embed=embed, view=ClosedTicketView(self, channel_id))
-                    
-                    overwrites = channel.overwrites
-                    for target, overwrite in overwrites.items():
-                        if target != channel.guild.default_role:
-                            overwrite.send_messages = False
-                            await channel.set_permissions(target, overwrite=overwrite)
-                    
-                    if not channel.name.startswith("fermé-"):
-                        await channel.edit(name=f"fermé-{channel.name}")
+                    await self.apply_ticket_state(channel, closed=True, reason=f"Inactivité ({delay_hours}h sans réponse)")
                     
                     self.logger.info(f"Ticket {channel_id} fermé automatiquement pour inactivité")
                     
@@ -856,16 +1295,10 @@ class TicketsCog(commands.Cog):
         await interaction.response.defer(ephemeral=True)
 
         try:
-            from modules.Database import db
-            from modules.TicketManager import TicketData
-
-            ticket = self.ticket_manager.tickets.get(channel_id)
+            ticket = await self.ticket_manager.lookup_ticket(channel_id)
             if not ticket:
-                ticket_data_db = db.get_ticket_by_channel(str(channel_id))
-                if not ticket_data_db:
-                    await interaction.followup.send("❌ Ticket non trouvé", ephemeral=True)
-                    return
-                ticket = TicketData.from_db(ticket_data_db)
+                await interaction.followup.send("❌ Ticket non trouvé", ephemeral=True)
+                return
 
             if not ticket.is_closed:
                 await interaction.followup.send("❌ Ce ticket n'est pas fermé", ephemeral=True)
@@ -875,18 +1308,11 @@ class TicketsCog(commands.Cog):
                 await interaction.followup.send("❌ Vous n'avez pas la permission", ephemeral=True)
                 return
 
-            self.ticket_manager.reopen_ticket(channel_id)
+            await self.ticket_manager.reopen_ticket(channel_id)
 
             channel = self.bot.get_channel(channel_id)
             if channel:
-                overwrites = channel.overwrites
-                for target, overwrite in overwrites.items():
-                    if target != channel.guild.default_role:
-                        overwrite.send_messages = True
-                        await channel.set_permissions(target, overwrite=overwrite)
-
-                if channel.name.startswith("fermé-"):
-                    await channel.edit(name=channel.name[len("fermé-"):])
+                await self.apply_ticket_state(channel, closed=False, reason=f"Réouvert par {interaction.user}")
 
                 embed = discord.Embed(
                     title="🔓 Ticket Réouvert",
@@ -922,9 +1348,7 @@ class TicketsCog(commands.Cog):
         if interaction.user.id == ticket.owner_id:
             return True
 
-        ticket_type = Config.TicketTypes.get(ticket.type_key, {})
-        staff_roles = ticket_type.get("staff_roles_id", [])
-        if any(role.id in staff_roles for role in interaction.user.roles):
+        if self.ticket_types.is_staff(interaction.user, ticket.type_key):
             return True
 
         return False
@@ -946,6 +1370,7 @@ class TicketsCog(commands.Cog):
 
 
 async def setup(bot: commands.Bot):
+    bot.add_dynamic_items(TicketButton)
     cog = TicketsCog(bot)
     await cog.cog_load()
     await bot.add_cog(cog)
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import re
+from typing import Dict, List, Optional
+
+import discord
+
+from modules.TicketTypeRegistry import TicketTypeRegistry
+
+CATEGORY_CHANNEL_LIMIT = 50  # Limite Discord de canaux par catégorie
+
+
+class CategoryPlacer:
+    """Choisit la catégorie la moins chargée pour un nouveau ticket.
+
+    Un type de ticket peut déclarer plusieurs catégories ("category_id" accepte une liste)
+    et un nom de série de débordement ("overflow_category") : quand toutes sont pleines,
+    une nouvelle catégorie "<nom> <n>" est créée. Le nombre de canaux par catégorie est
+    tenu en mémoire à partir des événements de création/suppression de canaux.
+    """
+
+    def __init__(self, registry: TicketTypeRegistry, limit: int = CATEGORY_CHANNEL_LIMIT):
+        self.registry = registry
+        self.limit = limit
+        self.logger = logging.getLogger("CategoryPlacer")
+        self.counts: Dict[int, int] = {}
+        self.reserved: Dict[int, int] = {}
+        self.overflow: Dict[str, List[int]] = {}
+        self.overflow_lock = asyncio.Lock()
+
+    @staticmethod
+    def overflow_index(category: discord.abc.GuildChannel, base_name: str) -> Optional[int]:
+        """Numéro n d'une catégorie nommée exactement "<base_name> <n>", sinon None."""
+        match = re.fullmatch(rf"{re.escape(base_name)} (\d+)", category.name)
+        return int(match.group(1)) if match else None
+
+    def configured_ids(self, type_key: str) -> List[int]:
+        ticket_type = self.registry.get(type_key)
+        return list(ticket_type.category_ids) if ticket_type else []
+
+    def load(self, guild: discord.Guild):
+        self.counts.clear()
+        for channel in guild.channels:
+            if channel.category_id:
+                self.counts[channel.category_id] = self.counts.get(channel.category_id, 0) + 1
+
+        self.overflow.clear()
+        for type_key, ticket_type in self.registry.types.items():
+            base_name = ticket_type.overflow_category
+            if not base_name:
+                continue
+            self.overflow[type_key] = [
+                category.id for category in guild.categories
+                if self.overflow_index(category, base_name) is not None and category.id not in self.configured_ids(type_key)
+            ]
+
+    def channel_created(self, channel: discord.abc.GuildChannel):
+        if channel.category_id:
+            self.counts[channel.category_id] = self.counts.get(channel.category_id, 0) + 1
+
+    def channel_deleted(self, channel: discord.abc.GuildChannel):
+        if channel.category_id and self.counts.get(channel.category_id):
+            self.counts[channel.category_id] -= 1
+        if isinstance(channel, discord.CategoryChannel):
+            self.counts.pop(channel.id, None)
+            for category_ids in self.overflow.values():
+                if channel.id in category_ids:
+                    category_ids.remove(channel.id)
+
+    def channel_moved(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        if before.category_id != after.category_id:
+            self.channel_deleted(before)
+            self.channel_created(after)
+
+    def load_of(self, category_id: int) -> int:
+        return self.counts.get(category_id, 0) + self.reserved.get(category_id, 0)
+
+    def reserve(self, category_id: int):
+        """Compte un canal en cours de création, pour que deux créations simultanées
+        ne choisissent pas la même dernière place."""
+        self.reserved[category_id] = self.reserved.get(category_id, 0) + 1
+
+    def release(self, category_id: int):
+        remaining = self.reserved.get(category_id, 0) - 1
+        if remaining > 0:
+            self.reserved[category_id] = remaining
+        else:
+            self.reserved.pop(category_id, None)
+
+    def pick(self, guild: discord.Guild, type_key: str) -> Optional[discord.CategoryChannel]:
+        best = None
+        for category_id in self.configured_ids(type_key) + self.overflow.get(type_key, []):
+            category = guild.get_channel(category_id)
+            if not isinstance(category, discord.CategoryChannel) or self.load_of(category_id) >= self.limit:
+                continue
+            if best is None or self.load_of(category_id) < self.load_of(best.id):
+                best = category
+        return best
+
+    async def place(self, guild: discord.Guild, type_key: str) -> Optional[discord.CategoryChannel]:
+        """Catégorie la moins chargée, en créant une catégorie de débordement si besoin."""
+        category = self.pick(guild, type_key)
+        ticket_type = self.registry.get(type_key)
+        base_name = ticket_type.overflow_category if ticket_type else None
+        if category is not None or not base_name:
+            return category
+
+        async with self.overflow_lock:
+            # Une autre création a pu ouvrir une catégorie pendant l'attente du verrou
+            category = self.pick(guild, type_key)
+            if category is not None:
+                return category
+
+            template = next(
+                (guild.get_channel(category_id) for category_id in self.configured_ids(type_key) if guild.get_channel(category_id)),
+                None
+            )
+            overflow_ids = self.overflow.setdefault(type_key, [])
+            # Numéro suivant le plus grand existant : une catégorie supprimée ne crée pas de doublon
+            indexes = [
+                self.overflow_index(guild.get_channel(category_id), base_name)
+                for category_id in overflow_ids if guild.get_channel(category_id)
+            ]
+            next_index = max((index for index in indexes if index is not None), default=1) + 1
+            options = {"overwrites": template.overwrites, "position": template.position + 1} if template else {}
+            category = await guild.create_category(name=f"{base_name} {next_index}", **options)
+            overflow_ids.append(category.id)
+            self.logger.info(f"Catégorie de débordement {category.name} créée pour le type {type_key}")
+            return category
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional
+
+import discord
+
+from modules.CategoryPlacer import CategoryPlacer
+from modules.TicketTypeRegistry import TicketTypeRegistry
+
+POOL_TOPIC_PREFIX = "ticket-pool:"  # Marque les canaux de réserve pour les retrouver après un redémarrage
+POOL_CHANNEL_NAME = "ticket-reserve"
+POOL_REFILL_DELAY = 2  # Secondes entre deux créations de canaux de réserve
+
+
+class ChannelPool:
+    """Réserve de canaux cachés pré-créés par type de ticket.
+
+    Ouvrir un ticket revient alors à prendre un canal de la réserve et à lui appliquer
+    nom et permissions en un seul edit ; une tâche de fond recrée les canaux consommés.
+    La taille cible vient de la clé "pool_size" de chaque entrée de Config.TicketTypes.
+    """
+
+    def __init__(self, registry: TicketTypeRegistry, placer: CategoryPlacer):
+        self.registry = registry
+        self.placer = placer
+        self.logger = logging.getLogger("ChannelPool")
+        self.channels: Dict[str, List[int]] = {}
+        self.refill_tasks: Dict[str, asyncio.Task] = {}
+
+    def target_size(self, type_key: str) -> int:
+        ticket_type = self.registry.get(type_key)
+        return ticket_type.pool_size if ticket_type else 0
+
+    def available(self, type_key: str) -> int:
+        return len(self.channels.get(type_key, []))
+
+    def adopt(self, guild: discord.Guild):
+        """Récupère les canaux de réserve existants (créés avant un redémarrage)."""
+        adopted = 0
+        for channel in guild.text_channels:
+            topic = channel.topic or ""
+            if not topic.startswith(POOL_TOPIC_PREFIX):
+                continue
+            type_key = topic[len(POOL_TOPIC_PREFIX):]
+            if type_key not in self.registry:
+                continue
+            channels = self.channels.setdefault(type_key, [])
+            if channel.id not in channels:
+                channels.append(channel.id)
+                adopted += 1
+        if adopted:
+            self.logger.info(f"{adopted} canaux de réserve récupérés")
+
+    def start(self, guild: discord.Guild):
+        self.adopt(guild)
+        for type_key in self.registry.types:
+            self.request_refill(guild, type_key)
+
+    def stop(self):
+        for task in self.refill_tasks.values():
+            task.cancel()
+        self.refill_tasks.clear()
+
+    def acquire(self, guild: discord.Guild, type_key: str) -> Optional[discord.TextChannel]:
+        """Prend un canal de la réserve (None si elle est vide) et relance le remplissage."""
+        channels = self.channels.get(type_key, [])
+        channel = None
+        while channels and channel is None:
+            channel = guild.get_channel(channels.pop(0))
+        if self.target_size(type_key):
+            self.request_refill(guild, type_key)
+        return channel
+
+    def discard(self, channel_id: int):
+        for channels in self.channels.values():
+            if channel_id in channels:
+                channels.remove(channel_id)
+
+    def request_refill(self, guild: discord.Guild, type_key: str):
+        if self.available(type_key) >= self.target_size(type_key):
+            return
+        task = self.refill_tasks.get(type_key)
+        if task is None or task.done():
+            self.refill_tasks[type_key] = asyncio.create_task(self._refill(guild, type_key))
+
+    async def _refill(self, guild: discord.Guild, type_key: str):
+        try:
+            while self.available(type_key) < self.target_size(type_key):
+                category = await self.placer.place(guild, type_key)
+                if category is None:
+                    self.logger.warning(f"Aucune catégorie disponible pour la réserve du type {type_key}")
+                    return
+                overwrites = {
+                    guild.default_role: discord.PermissionOverwrite(view_channel=False),
+                    guild.me: discord.PermissionOverwrite(view_channel=True, send_messages=True, manage_channels=True),
+                }
+                # Même réservation que la création d'un ticket : la limite de 50 canaux reste respectée
+                self.placer.reserve(category.id)
+                try:
+                    channel = await category.create_text_channel(
+                        name=POOL_CHANNEL_NAME,
+                        overwrites=overwrites,
+                        topic=f"{POOL_TOPIC_PREFIX}{type_key}"
+                    )
+                finally:
+                    self.placer.release(category.id)
+                self.channels.setdefault(type_key, []).append(channel.id)
+                await asyncio.sleep(POOL_REFILL_DELAY)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.logger.error(f"Erreur remplissage réserve {type_key}: {e}")
+        finally:
+            self.refill_tasks.pop(type_key, None)
@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from enum import Enum
+from typing import Deque, Dict, Optional, Tuple
+
+import discord
+
+RENAME_LIMIT = 2  # Discord n'autorise qu'environ 2 renommages de canal...
+RENAME_WINDOW = 600  # ...par fenêtre de 10 minutes
+
+
+class RenameResult(Enum):
+    APPLIED = "applied"  # Canal renommé immédiatement
+    QUEUED = "queued"  # Quota épuisé, renommage différé
+    UNCHANGED = "unchanged"  # Le canal porte déjà ce nom
+
+
+class ChannelRenamer:
+    """Regroupe les renommages de canaux pour ne jamais attendre le rate limit de Discord.
+
+    Chaque canal a son propre compartiment de RENAME_LIMIT renommages par RENAME_WINDOW
+    secondes. Tant que le compartiment est plein, seul le dernier nom demandé est conservé
+    et une tâche de fond l'applique dès qu'un renommage se libère.
+    """
+
+    def __init__(self, limit: int = RENAME_LIMIT, window: float = RENAME_WINDOW):
+        self.limit = limit
+        self.window = window
+        self.logger = logging.getLogger("ChannelRenamer")
+        self.history: Dict[int, Deque[float]] = {}
+        self.pending: Dict[int, str] = {}
+        self.tasks: Dict[int, asyncio.Task] = {}
+
+    def _prune(self, channel_id: int) -> Deque[float]:
+        history = self.history.setdefault(channel_id, deque())
+        now = time.monotonic()
+        while history and now - history[0] >= self.window:
+            history.popleft()
+        if not history:
+            del self.history[channel_id]
+        return history
+
+    def _next_slot(self, channel_id: int) -> float:
+        """Secondes à attendre avant qu'un renommage soit disponible (0 si immédiat)."""
+        history = self._prune(channel_id)
+        if len(history) < self.limit:
+            return 0.0
+        return max(0.0, history[0] + self.window - time.monotonic())
+
+    def _record(self, channel_id: int):
+        self.history.setdefault(channel_id, deque()).append(time.monotonic())
+
+    def effective_name(self, channel: discord.abc.GuildChannel) -> str:
+        """Nom qu'aura le canal une fois les renommages en attente appliqués."""
+        return self.pending.get(channel.id, channel.name)
+
+    def get_pending(self, channel_id: int) -> Optional[Tuple[str, float]]:
+        """Nom en attente et délai estimé en secondes, ou None."""
+        name = self.pending.get(channel_id)
+        if name is None:
+            return None
+        return name, self._next_slot(channel_id)
+
+    def claim(self, channel: discord.abc.GuildChannel, name: str) -> bool:
+        """Retourne True si le renommage peut être appliqué tout de suite par l'appelant
+        (le créneau est alors consommé), sinon le met en attente et retourne False."""
+        if name == channel.name:
+            self.pending.pop(channel.id, None)
+            return False
+        if channel.id not in self.pending and self._next_slot(channel.id) == 0:
+            self._record(channel.id)
+            return True
+        self.pending[channel.id] = name
+        task = self.tasks.get(channel.id)
+        if task is None or task.done():
+            self.tasks[channel.id] = asyncio.create_task(self._drain(channel))
+        return False
+
+    async def rename(self, channel: discord.abc.GuildChannel, name: str, reason: Optional[str] = None) -> RenameResult:
+        """Renomme le canal si possible, sinon planifie le renommage."""
+        if name == channel.name:
+            self.claim(channel, name)  # Annule un éventuel renommage en attente
+            return RenameResult.UNCHANGED
+        if not self.claim(channel, name):
+            return RenameResult.QUEUED
+        await channel.edit(name=name, reason=reason)
+        return RenameResult.APPLIED
+
+    async def _drain(self, channel: discord.abc.GuildChannel):
+        try:
+            while channel.id in self.pending:
+                delay = self._next_slot(channel.id)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                    continue
+                name = self.pending.pop(channel.id, None)
+                if name is None or name == channel.name:
+                    continue
+                self._record(channel.id)
+                try:
+                    await channel.edit(name=name)
+                    self.logger.info(f"Renommage différé appliqué: {channel.id} -> {name}")
+                except discord.NotFound:
+                    return
+                except Exception as e:
+                    self.logger.error(f"Erreur renommage différé {channel.id}: {e}")
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.tasks.pop(channel.id, None)
+
+    def forget(self, channel_id: int):
+        self.pending.pop(channel_id, None)
+        self.history.pop(channel_id, None)
+        task = self.tasks.pop(channel_id, None)
+        if task:
+            task.cancel()
+
+    def stop(self):
+        for task in list(self.tasks.values()):
+            task.cancel()
+        self.tasks.clear()
@@ -1,373 +1,678 @@
 import mysql.connector
+from mysql.connector import errorcode, pooling
+import asyncio
+import functools
 import os
 import json
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
+
+# Erreurs signalant une connexion perdue : on reconnecte, et seules les requêtes idempotentes sont rejouées une fois
+CONNECTION_ERRNOS = {
+    errorcode.CR_SERVER_GONE_ERROR,
+    errorcode.CR_SERVER_LOST,
+    errorcode.CR_SERVER_LOST_EXTENDED,
+    errorcode.CR_CONNECTION_ERROR,
+    errorcode.CR_CONN_HOST_ERROR,
+}
+
+MIGRATION_BATCH_SIZE = 1000
+
+GIVEAWAY_PARTICIPANTS_TABLE = """CREATE TABLE IF NOT EXISTS giveaway_participants (
+    giveaway_id VARCHAR(255) NOT NULL,
+    user_id BIGINT UNSIGNED NOT NULL,
+    joined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (giveaway_id, user_id),
+    FOREIGN KEY (giveaway_id) REFERENCES giveaways(giveaway_id) ON DELETE CASCADE
+)"""
+
+TICKET_MEMBERS_TABLE = """CREATE TABLE IF NOT EXISTS ticket_members (
+    channel_id VARCHAR(255) NOT NULL,
+    member_id BIGINT UNSIGNED NOT NULL,
+    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (channel_id, member_id),
+    INDEX idx_member_id (member_id),
+    FOREIGN KEY (channel_id) REFERENCES tickets(channel_id) ON DELETE CASCADE
+)"""
+
+# Le nombre de participants est calculé à partir de la table dédiée (PK couvrante)
+GIVEAWAY_SELECT = """SELECT g.*, (SELECT COUNT(*) FROM giveaway_participants p WHERE p.giveaway_id = g.giveaway_id)
+                     AS giveaway_participant_count FROM giveaways g"""
+
+
+class PooledConnection:
+    def __init__(self, connection):
+        self.connection = connection
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+
 
 class Database:
     def __init__(self):
-        self.connection = None
-        self.connect()
-    
+        # Une connexion du pool par thread : les requêtes lancées depuis AsyncDatabase
+        # s'exécutent dans des threads workers qui gardent chacun leur connexion.
+        self.pool_size = max(1, min(int(os.getenv("DB_POOL_SIZE", "5")), pooling.CNX_POOL_MAXSIZE))
+        self.reconnect_attempts = max(1, int(os.getenv("DB_RECONNECT_ATTEMPTS", "3")))
+        self.reconnect_backoff = float(os.getenv("DB_RECONNECT_BACKOFF", "0.5"))
+        self._pool: Optional[pooling.MySQLConnectionPool] = None
+        self._local = threading.local()
+        self._connections: List[PooledConnection] = []
+        self._connections_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.counters = {"queries": 0, "retries": 0, "reconnects": 0, "keepalive_pings": 0}
+        # Pas de connexion ici : le thread principal en garderait une du pool pour toujours
+        # et le dernier worker d'AsyncDatabase n'en obtiendrait jamais
+
+    @property
+    def connection(self):
+        pooled = getattr(self._local, "pooled", None)
+        return pooled.connection if pooled else None
+
     def connect(self):
         try:
-            self.connection = mysql.connector.connect(
-                host=os.getenv("DB_HOST", "localhost"),
-                user=os.getenv("DB_USER", "root"),
-                password=os.getenv("DB_PASSWORD", ""),
-                database=os.getenv("DB_NAME", "shadow_bot"),
-                port=int(os.getenv("DB_PORT", "3306"))
-            )
-            logging.info("Connexion à la base de données établie")
+            if self._pool is None:
+                self._pool = pooling.MySQLConnectionPool(
+                    pool_name="shadow_bot",
+                    pool_size=self.pool_size,
+                    pool_reset_session=False,
+                    host=os.getenv("DB_HOST", "localhost"),
+                    user=os.getenv("DB_USER", "root"),
+                    password=os.getenv("DB_PASSWORD", ""),
+                    database=os.getenv("DB_NAME", "shadow_bot"),
+                    port=int(os.getenv("DB_PORT", "3306"))
+                )
+            pooled = PooledConnection(self._pool.get_connection())
+            self._local.pooled = pooled
+            with self._connections_lock:
+                self._connections.append(pooled)
+            logging.info(f"Connexion à la base de données établie ({threading.current_thread().name})")
         except mysql.connector.Error as e:
             logging.error(f"Erreur de connexion à la base de données : {str(e)}")
             raise
-    
-    def ensure_connection(self):
-        try:
-            if self.connection is None or not self.connection.is_connected():
-                self.connect()
-        except Exception as e:
-            logging.error(f"Erreur lors de la vérification de la connexion : {str(e)}")
+
+    def ensure_connection(self) -> PooledConnection:
+        # Pas de ping ici : la santé de la connexion est vérifiée paresseusement par _run
+        if getattr(self._local, "pooled", None) is None:
             self.connect()
-    
+        return self._local.pooled
+
     def close(self):
-        if self.connection and self.connection.is_connected():
-            self.connection.close()
-            logging.info("Connexion à la base de données fermée")
-    
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for pooled in connections:
+            try:
+                pooled.connection.close()
+            except mysql.connector.Error:
+                pass
+        self._local = threading.local()
+        if connections:
+            logging.info("Connexions à la base de données fermées")
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.counters[key] += 1
+
+    def stats(self) -> Dict:
+        with self._stats_lock:
+            return dict(self.counters)
+
+    @staticmethod
+    def _is_connection_error(error: mysql.connector.Error) -> bool:
+        if error.errno in CONNECTION_ERRNOS:
+            return True
+        # "MySQL Connection not available" & co. n'ont pas de code serveur
+        return isinstance(error, (mysql.connector.errors.OperationalError, mysql.connector.errors.InterfaceError)) \
+            and error.errno in (None, -1)
+
+    def _reconnect(self, pooled: PooledConnection):
+        for attempt in range(self.reconnect_attempts):
+            try:
+                pooled.connection.reconnect(attempts=1)
+                self._count("reconnects")
+                logging.warning(f"Reconnexion à la base de données ({threading.current_thread().name})")
+                return
+            except mysql.connector.Error as e:
+                if attempt == self.reconnect_attempts - 1:
+                    logging.error(f"Reconnexion à la base de données impossible : {str(e)}")
+                    raise
+                time.sleep(self.reconnect_backoff * (2 ** attempt))
+
+    def _run(self, operation, idempotent: bool = False):
+        """Exécute operation avec la connexion du thread. Après une coupure, la connexion est
+        rétablie mais l'opération n'est rejouée que si elle est idempotente : une écriture a
+        pu être validée juste avant la coupure, la rejouer risquerait de la dupliquer."""
+        pooled = self.ensure_connection()
+        with pooled.lock:
+            self._count("queries")
+            try:
+                result = operation(pooled.connection)
+            except mysql.connector.Error as e:
+                if not self._is_connection_error(e):
+                    raise
+                self._reconnect(pooled)
+                if not idempotent:
+                    raise
+                self._count("retries")
+                result = operation(pooled.connection)
+            pooled.last_used = time.monotonic()
+            return result
+
+    def _execute(self, query: str, params: tuple = (), idempotent: bool = False) -> int:
+        def operation(connection):
+            cursor = connection.cursor()
+            try:
+                cursor.execute(query, params)
+                connection.commit()
+                return cursor.rowcount
+            finally:
+                cursor.close()
+        return self._run(operation, idempotent)
+
+    def _fetchone(self, query: str, params: tuple = (), dictionary: bool = False):
+        def operation(connection):
+            cursor = connection.cursor(dictionary=dictionary)
+            try:
+                cursor.execute(query, params)
+                return cursor.fetchone()
+            finally:
+                cursor.close()
+        return self._run(operation, idempotent=True)
+
+    def _fetchall(self, query: str, params: tuple = (), dictionary: bool = False) -> list:
+        def operation(connection):
+            cursor = connection.cursor(dictionary=dictionary)
+            try:
+                cursor.execute(query, params)
+                return cursor.fetchall()
+            finally:
+                cursor.close()
+        return self._run(operation, idempotent=True)
+
+    def keepalive(self, idle_seconds: float):
+        """Pinge les connexions inactives depuis idle_seconds pour éviter le wait_timeout du serveur."""
+        now = time.monotonic()
+        with self._connections_lock:
+            connections = list(self._connections)
+        for pooled in connections:
+            if now - pooled.last_used < idle_seconds or not pooled.lock.acquire(blocking=False):
+                continue
+            try:
+                pooled.connection.ping(reconnect=True, attempts=self.reconnect_attempts, delay=self.reconnect_backoff)
+                pooled.last_used = time.monotonic()
+                self._count("keepalive_pings")
+            except mysql.connector.Error as e:
+                logging.warning(f"Keepalive base de données échoué : {str(e)}")
+            finally:
+                pooled.lock.release()
+
     def create_giveaway(self, giveaway_id: str, server_id: str, channel_id: str, title: str,
                        prizes: List[str], winner_count: int, end_date: datetime, organizer_id: str,
                        conditions: Optional[str] = None) -> bool:
         try:
-            self.ensure_connection()
-            cursor = self.connection.cursor()
             query = """INSERT INTO giveaways (giveaway_id, server_id, giveaway_channel_id, giveaway_title,
                        giveaway_prizes, giveaway_winner_count, giveaway_end_date, giveaway_organizer_id,
-                       giveaway_participants, giveaway_conditions, giveaway_is_finished)
-                       VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"""
+                       giveaway_conditions, giveaway_is_finished)
+                       VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"""
             values = (giveaway_id, server_id, channel_id, title, json.dumps(prizes, ensure_ascii=False),
-                     winner_count, end_date, organizer_id, json.dumps([]), conditions, False)
-            cursor.execute(query, values)
-            self.connection.commit()
-            cursor.close()
+                     winner_count, end_date, organizer_id, conditions, False)
+            self._execute(query, values)
             logging.info(f"Giveaway {giveaway_id} créé")
             return True
         except mysql.connector.Error as e:
             logging.error(f"Erreur création giveaway : {str(e)}")
             return False
-    
+
     def update_giveaway_message_id(self, giveaway_id: str, message_id: int) -> bool:
         try:
-            self.ensure_connection()
-            cursor = self.connection.cursor()
-            cursor.execute("UPDATE giveaways SET giveaway_message_id = %s WHERE giveaway_id = %s",
-                         (str(message_id), giveaway_id))
-            self.connection.commit()
-            cursor.close()
+            self._execute("UPDATE giveaways SET giveaway_message_id = %s WHERE giveaway_id = %s",
+                          (str(message_id), giveaway_id), idempotent=True)
             return True
         except mysql.connector.Error as e:
             logging.error(f"Erreur mise à jour message_id : {str(e)}")
             return False
-    
-    def add_participant(self, giveaway_id: str, user_id: int) -> bool:
-        try:
-            self.ensure_connection()
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT giveaway_participants FROM giveaways WHERE giveaway_id = %s", (giveaway_id,))
-            result = cursor.fetchone()
-            if not result:
-                cursor.close()
-                return False
-            participants = json.loads(result[0]) if result[0] else []
-            if user_id in participants:
+
+    def get_participants(self, giveaway_id: str) -> List[int]:
+        try:
+            results = self._fetchall("SELECT user_id FROM giveaway_participants WHERE giveaway_id = %s", (giveaway_id,))
+            return [int(row[0]) for row in results]
+        except mysql.connector.Error as e:
+            logging.error(f"Erreur récupération participants : {str(e)}")
+            return []
+
+    def load_participants(self, giveaway_id: str) -> Optional[List[int]]:
+        """Comme get_participants mais retourne None en cas d'erreur (pour ne pas mettre en cache une liste vide)."""
+        try:
+            results = self._fetchall("SELECT user_id FROM giveaway_participants WHERE giveaway_id = %s", (giveaway_id,))
+            return [int(row[0]) for row in results]
+        except mysql.connector.Error as e:
+            logging.error(f"Erreur chargement participants : {str(e)}")
+            return None
+
+    def apply_participant_changes(self, added: List[Tuple[str, int]], removed: List[Tuple[str, int]]) -> bool:
+        """Applique un lot d'inscriptions/désinscriptions en une transaction.
+        INSERT IGNORE rend le rejeu idempotent et ignore les giveaways supprimés entre-temps."""
+        def operation(connection):
+            cursor = connection.cursor()
+            try:
+                if added:
+                    cursor.executemany("INSERT IGNORE INTO giveaway_participants (giveaway_id, user_id) VALUES (%s, %s)", added)
+                if removed:
+                    cursor.executemany("DELETE FROM giveaway_participants WHERE giveaway_id = %s AND user_id = %s", removed)
+                connection.commit()
+            except mysql.connector.Error:
+                connection.rollback()
+                raise
+            finally:
                 cursor.close()
-                return False
-            participants.append(user_id)
-            cursor.execute("UPDATE giveaways SET giveaway_participants = %s WHERE giveaway_id = %s",
-                         (json.dumps(participants), giveaway_id))
-            self.connection.commit()
-            cursor.close()
+        try:
+            self._run(operation, idempotent=True)
             return True
         except mysql.connector.Error as e:
-            logging.error(f"Erreur ajout participant : {str(e)}")
+            logging.error(f"Erreur écriture participants : {str(e)}")
             return False
-    
-    def remove_participant(self, giveaway_id: str, user_id: int) -> bool:
-        try:
-            self.ensure_connection()
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT giveaway_participants FROM giveaways WHERE giveaway_id = %s", (giveaway_id,))
-            result = cursor.fetchone()
-            if not result:
+
+    def migrate_giveaway_participants(self) -> int:
+        """Migration unique de l'ancienne colonne JSON giveaways.giveaway_participants
+        vers la table giveaway_participants. Sans effet une fois la colonne supprimée."""
+        def operation(connection):
+            cursor = connection.cursor()
+            try:
+                cursor.execute(GIVEAWAY_PARTICIPANTS_TABLE)
+                cursor.execute("""SELECT COUNT(*) FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE()
+                                  AND TABLE_NAME = 'giveaways' AND COLUMN_NAME = 'giveaway_participants'""")
+                if not cursor.fetchone()[0]:
+                    return 0
+                cursor.execute("SELECT giveaway_id, giveaway_participants FROM giveaways WHERE giveaway_participants IS NOT NULL")
+                rows = cursor.fetchall()
+                values = [(giveaway_id, int(user_id)) for giveaway_id, raw in rows for user_id in (json.loads(raw) if raw else [])]
+                for start in range(0, len(values), MIGRATION_BATCH_SIZE):
+                    cursor.executemany("INSERT IGNORE INTO giveaway_participants (giveaway_id, user_id) VALUES (%s, %s)",
+                                       values[start:start + MIGRATION_BATCH_SIZE])
+                connection.commit()
+                cursor.execute("ALTER TABLE giveaways DROP COLUMN giveaway_participants")
+                return len(values)
+            finally:
                 cursor.close()
-                return False
-            participants = json.loads(result[0]) if result[0] else []
-            if user_id not in participants:
+
+        try:
+            migrated = self._run(operation, idempotent=True)
+            if migrated:
+                logging.info(f"Migration giveaway_participants : {migrated} participations copiées")
+            return migrated
+        except mysql.connector.Error as e:
+            logging.error(f"Erreur migration participants giveaway : {str(e)}")
+            return 0
+
+    def add_column_if_missing(self, table: str, column: str, definition: str) -> bool:
+        """Migration : ajoute la colonne si elle n'existe pas encore. Retourne True si ajoutée."""
+        def operation(connection):
+            cursor = connection.cursor()
+            try:
+                cursor.execute("""SELECT COUNT(*) FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE()
+                                  AND TABLE_NAME = %s AND COLUMN_NAME = %s""", (table, column))
+                if cursor.fetchone()[0]:
+                    return False
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+                return True
+            finally:
                 cursor.close()
-                return False
-            participants.remove(user_id)
-            cursor.execute("UPDATE giveaways SET giveaway_participants = %s WHERE giveaway_id = %s",
-                         (json.dumps(participants), giveaway_id))
-            self.connection.commit()
-            cursor.close()
+
+        try:
+            added = self._run(operation, idempotent=True)
+            if added:
+                logging.info(f"Migration : colonne {table}.{column} ajoutée")
+            return added
+        except mysql.connector.Error as e:
+            logging.error(f"Erreur migration colonne {table}.{column} : {str(e)}")
+            return False
+
+    def migrate_giveaway_state(self) -> bool:
+        """Ajoute les colonnes de la machine à états de fin de giveaway et les remplit
+        pour les giveaways déjà terminés."""
+        added = self.add_column_if_missing("giveaways", "giveaway_state", "VARCHAR(16) NOT NULL DEFAULT 'active'")
+        self.add_column_if_missing("giveaways", "giveaway_winners", "TEXT NULL")
+        self.add_column_if_missing("giveaways", "giveaway_claim_token", "VARCHAR(32) NULL")
+        self.add_column_if_missing("giveaways", "giveaway_claimed_at", "TIMESTAMP NULL DEFAULT NULL")
+        if not added:
+            return False
+        try:
+            self._execute("UPDATE giveaways SET giveaway_state = 'announced' WHERE giveaway_is_finished = TRUE", idempotent=True)
             return True
         except mysql.connector.Error as e:
-            logging.error(f"Erreur retrait participant : {str(e)}")
+            logging.error(f"Erreur migration état giveaways : {str(e)}")
+            return False
+
+    def claim_giveaway_draw(self, giveaway_id: str, token: str) -> bool:
+        """active -> drawing : attribue la finalisation au jeton de l'appelant.
+        Seul le premier appel réussit ; les suivants (autre tick, autre instance) retournent False."""
+        try:
+            updated = self._execute(
+                """UPDATE giveaways SET giveaway_state = 'drawing', giveaway_claim_token = %s, giveaway_claimed_at = NOW()
+                   WHERE giveaway_id = %s AND giveaway_state = 'active'""",
+                (token, giveaway_id)
+            )
+            return updated == 1
+        except mysql.connector.Error as e:
+            logging.error(f"Erreur réservation tirage giveaway : {str(e)}")
             return False
-    
+
+    def set_giveaway_winners(self, giveaway_id: str, winners: List[int], token: str) -> bool:
+        """Enregistre le tirage une seule fois, et seulement pour le détenteur du jeton."""
+        try:
+            updated = self._execute(
+                """UPDATE giveaways SET giveaway_winners = %s
+                   WHERE giveaway_id = %s AND giveaway_state = 'drawing' AND giveaway_claim_token = %s
+                   AND giveaway_winners IS NULL""",
+                (json.dumps(winners), giveaway_id, token)
+            )
+            return updated == 1
+        except mysql.connector.Error as e:
+            logging.error(f"Erreur enregistrement gagnants giveaway : {str(e)}")
+            return False
+
+    def reclaim_giveaway_draw(self, giveaway_id: str, token: str, lease_seconds: int) -> bool:
+        """Reprend un giveaway resté en 'drawing' (arrêt brutal) une fois le bail de l'ancien jeton expiré."""
+        try:
+            updated = self._execute(
+                """UPDATE giveaways SET giveaway_claim_token = %s, giveaway_claimed_at = NOW()
+                   WHERE giveaway_id = %s AND giveaway_state = 'drawing'
+                   AND (giveaway_claimed_at IS NULL OR giveaway_claimed_at < NOW() - INTERVAL %s SECOND)""",
+                (token, giveaway_id, lease_seconds)
+            )
+            return updated == 1
+        except mysql.connector.Error as e:
+            logging.error(f"Erreur reprise giveaway : {str(e)}")
+            return False
+
+    def mark_giveaway_announced(self, giveaway_id: str, token: str) -> bool:
+        """drawing -> announced, seulement si le jeton est toujours celui de l'appelant."""
+        try:
+            updated = self._execute(
+                """UPDATE giveaways SET giveaway_state = 'announced', giveaway_is_finished = TRUE,
+                   giveaway_claim_token = NULL
+                   WHERE giveaway_id = %s AND giveaway_state = 'drawing' AND giveaway_claim_token = %s""",
+                (giveaway_id, token)
+            )
+            return updated == 1
+        except mysql.connector.Error as e:
+            logging.error(f"Erreur marquage giveaway annoncé : {str(e)}")
+            return False
+
+    @staticmethod
+    def _decode_giveaway(result: Optional[Dict]) -> Optional[Dict]:
+        if result:
+            result['giveaway_prizes'] = json.loads(result['giveaway_prizes'])
+            if result.get('giveaway_winners') is not None:
+                result['giveaway_winners'] = [int(user_id) for user_id in json.loads(result['giveaway_winners'])]
+        return result
+
     def get_giveaway(self, giveaway_id: str) -> Optional[Dict]:
         try:
-            self.ensure_connection()
-            cursor = self.connection.cursor(dictionary=True)
-            cursor.execute("SELECT * FROM giveaways WHERE giveaway_id = %s", (giveaway_id,))
-            result = cursor.fetchone()
-            cursor.close()
-            if result:
-                result['giveaway_prizes'] = json.loads(result['giveaway_prizes'])
-                result['giveaway_participants'] = json.loads(result['giveaway_participants']) if result['giveaway_participants'] else []
-            return result
+            result = self._fetchone(f"{GIVEAWAY_SELECT} WHERE g.giveaway_id = %s", (giveaway_id,), dictionary=True)
+            return self._decode_giveaway(result)
         except mysql.connector.Error as e:
             logging.error(f"Erreur récupération giveaway : {str(e)}")
             return None
-    
-    def get_active_giveaways(self, server_id: Optional[str] = None) -> List[Dict]:
-        try:
-            self.ensure_connection()
-            cursor = self.connection.cursor(dictionary=True)
-            if server_id:
-                cursor.execute("SELECT * FROM giveaways WHERE giveaway_is_finished = FALSE AND server_id = %s", (server_id,))
-            else:
-                cursor.execute("SELECT * FROM giveaways WHERE giveaway_is_finished = FALSE")
-            results = cursor.fetchall()
-            cursor.close()
-            for result in results:
-                result['giveaway_prizes'] = json.loads(result['giveaway_prizes'])
-                result['giveaway_participants'] = json.loads(result['giveaway_participants']) if result['giveaway_participants'] else []
-            return results
-        except mysql.connector.Error as e:
-            logging.error(f"Erreur récupération giveaways actifs : {str(e)}")
-            return []
-    
+
+    def load_giveaway(self, giveaway_id: str) -> Optional[Dict]:
+        """Comme get_giveaway mais distingue les cas : {} si le giveaway n'existe pas, None en cas d'erreur."""
+        try:
+            result = self._fetchone(f"{GIVEAWAY_SELECT} WHERE g.giveaway_id = %s", (giveaway_id,), dictionary=True)
+            return self._decode_giveaway(result) if result else {}
+        except mysql.connector.Error as e:
+            logging.error(f"Erreur chargement giveaway : {str(e)}")
+            return None
+
+    def get_giveaway_deadlines(self) -> Optional[List[Tuple[str, datetime]]]:
+        """(giveaway_id, giveaway_end_date) des giveaways actifs, sans participants ni décodage JSON.
+        None en cas d'erreur (à ne pas confondre avec « aucun giveaway actif »)."""
+        try:
+            rows = self._fetchall("SELECT giveaway_id, giveaway_end_date FROM giveaways WHERE giveaway_is_finished = FALSE")
+            return [(row[0], row[1]) for row in rows]
+        except mysql.connector.Error as e:
+            logging.error(f"Erreur récupération échéances giveaways : {str(e)}")
+            return None
+
     def get_active_giveaway_by_channel(self, channel_id: str) -> Optional[Dict]:
         try:
-            self.ensure_connection()
-            cursor = self.connection.cursor(dictionary=True)
-            query = """SELECT * FROM giveaways WHERE giveaway_channel_id = %s AND giveaway_is_finished = FALSE
-                       ORDER BY created_at DESC LIMIT 1"""
-            cursor.execute(query, (channel_id,))
-            result = cursor.fetchone()
-            cursor.close()
-            if result:
-                result['giveaway_prizes'] = json.loads(result['giveaway_prizes'])
-                result['giveaway_participants'] = json.loads(result['giveaway_participants']) if result['giveaway_participants'] else []
-            return result
+            query = f"""{GIVEAWAY_SELECT} WHERE g.giveaway_channel_id = %s AND g.giveaway_is_finished = FALSE
+                       ORDER BY g.created_at DESC LIMIT 1"""
+            result = self._fetchone(query, (channel_id,), dictionary=True)
+            return self._decode_giveaway(result)
         except mysql.connector.Error as e:
             logging.error(f"Erreur récupération giveaway par canal : {str(e)}")
             return None
-    
-    def mark_giveaway_finished(self, giveaway_id: str) -> bool:
-        try:
-            self.ensure_connection()
-            cursor = self.connection.cursor()
-            cursor.execute("UPDATE giveaways SET giveaway_is_finished = TRUE WHERE giveaway_id = %s", (giveaway_id,))
-            self.connection.commit()
-            cursor.close()
-            return True
-        except mysql.connector.Error as e:
-            logging.error(f"Erreur marquage giveaway terminé : {str(e)}")
-            return False
-    
+
     def delete_giveaway(self, giveaway_id: str) -> bool:
         try:
-            self.ensure_connection()
-            cursor = self.connection.cursor()
-            cursor.execute("DELETE FROM giveaways WHERE giveaway_id = %s", (giveaway_id,))
-            self.connection.commit()
-            cursor.close()
+            self._execute("DELETE FROM giveaways WHERE giveaway_id = %s", (giveaway_id,), idempotent=True)
             return True
         except mysql.connector.Error as e:
             logging.error(f"Erreur suppression giveaway : {str(e)}")
             return False
-    
+
     def get_giveaway_by_message_id(self, message_id: str) -> Optional[Dict]:
         try:
-            self.ensure_connection()
-            cursor = self.connection.cursor(dictionary=True)
-            cursor.execute("SELECT * FROM giveaways WHERE giveaway_message_id = %s", (message_id,))
-            result = cursor.fetchone()
-            cursor.close()
-            if result:
-                result['giveaway_prizes'] = json.loads(result['giveaway_prizes'])
-                result['giveaway_participants'] = json.loads(result['giveaway_participants']) if result['giveaway_participants'] else []
-            return result
+            result = self._fetchone(f"{GIVEAWAY_SELECT} WHERE g.giveaway_message_id = %s", (message_id,), dictionary=True)
+            return self._decode_giveaway(result)
         except mysql.connector.Error as e:
             logging.error(f"Erreur récupération giveaway par message_id : {str(e)}")
             return None
 
     def create_ticket(self, server_id: str, channel_id: str, owner_id: str, type_key: str, members: List[int] = None) -> Optional[int]:
+        def operation(connection):
+            cursor = connection.cursor()
+            try:
+                query = """INSERT INTO tickets (server_id, channel_id, owner_id, type_key)
+                           VALUES (%s, %s, %s, %s)"""
+                cursor.execute(query, (server_id, channel_id, owner_id, type_key))
+                ticket_id = cursor.lastrowid
+                cursor.executemany("INSERT IGNORE INTO ticket_members (channel_id, member_id) VALUES (%s, %s)",
+                                   [(channel_id, member_id) for member_id in (members if members else [int(owner_id)])])
+                connection.commit()
+                return ticket_id
+            except mysql.connector.Error:
+                connection.rollback()
+                raise
+            finally:
+                cursor.close()
+
         try:
-            self.ensure_connection()
-            cursor = self.connection.cursor()
-            members_json = json.dumps(members if members else [int(owner_id)])
-            query = """INSERT INTO tickets (server_id, channel_id, owner_id, type_key, members)
-                       VALUES (%s, %s, %s, %s, %s)"""
-            cursor.execute(query, (server_id, channel_id, owner_id, type_key, members_json))
-            self.connection.commit()
-            ticket_id = cursor.lastrowid
-            cursor.close()
+            ticket_id = self._run(operation)
             logging.info(f"Ticket {ticket_id} créé pour le serveur {server_id}, canal {channel_id}")
             return ticket_id
         except mysql.connector.Error as e:
             logging.error(f"Erreur création ticket : {str(e)}")
             return None
-    
+
+    def _attach_ticket_members(self, tickets: List[Dict]) -> List[Dict]:
+        if not tickets:
+            return tickets
+        channel_ids = [ticket['channel_id'] for ticket in tickets]
+        placeholders = ", ".join(["%s"] * len(channel_ids))
+        rows = self._fetchall(f"SELECT channel_id, member_id FROM ticket_members WHERE channel_id IN ({placeholders})",
+                              tuple(channel_ids))
+        members_by_channel: Dict[str, List[int]] = {}
+        for channel_id, member_id in rows:
+            members_by_channel.setdefault(channel_id, []).append(int(member_id))
+        for ticket in tickets:
+            ticket['members'] = members_by_channel.get(ticket['channel_id'], [])
+        return tickets
+
     def get_ticket_by_channel(self, channel_id: str) -> Optional[Dict]:
         try:
-            self.ensure_connection()
-            cursor = self.connection.cursor(dictionary=True)
-            cursor.execute("SELECT * FROM tickets WHERE channel_id = %s", (channel_id,))
-            result = cursor.fetchone()
-            cursor.close()
-            if result and result.get('members'):
-                result['members'] = json.loads(result['members'])
+            result = self._fetchone("SELECT * FROM tickets WHERE channel_id = %s", (channel_id,), dictionary=True)
+            if result:
+                self._attach_ticket_members([result])
             return result
         except mysql.connector.Error as e:
             logging.error(f"Erreur récupération ticket : {str(e)}")
             return None
-    
+
     def get_user_tickets(self, server_id: str, owner_id: str, is_closed: bool = False) -> List[Dict]:
         try:
-            self.ensure_connection()
-            cursor = self.connection.cursor(dictionary=True)
             query = """SELECT * FROM tickets WHERE server_id = %s AND owner_id = %s AND is_closed = %s"""
-            cursor.execute(query, (server_id, owner_id, is_closed))
-            results = cursor.fetchall()
-            cursor.close()
-            for result in results:
-                if result.get('members'):
-                    result['members'] = json.loads(result['members'])
-            return results
+            results = self._fetchall(query, (server_id, owner_id, is_closed), dictionary=True)
+            return self._attach_ticket_members(results)
         except mysql.connector.Error as e:
             logging.error(f"Erreur récupération tickets utilisateur : {str(e)}")
             return []
-    
-    def update_ticket_owner_message(self, channel_id: str) -> bool:
-        try:
-            self.ensure_connection()
-            cursor = self.connection.cursor()
-            cursor.execute("UPDATE tickets SET last_owner_message = NOW() WHERE channel_id = %s", (channel_id,))
-            self.connection.commit()
-            cursor.close()
+
+    def get_ticket_members_by_server(self, server_id: str, is_closed: bool = False) -> Dict[str, List[int]]:
+        try:
+            query = """SELECT m.channel_id, m.member_id FROM ticket_members m JOIN tickets t ON t.channel_id = m.channel_id
+                       WHERE t.server_id = %s AND t.is_closed = %s"""
+            members_by_channel: Dict[str, List[int]] = {}
+            for channel_id, member_id in self._fetchall(query, (server_id, is_closed)):
+                members_by_channel.setdefault(channel_id, []).append(int(member_id))
+            return members_by_channel
+        except mysql.connector.Error as e:
+            logging.error(f"Erreur récupération membres des tickets : {str(e)}")
+            return {}
+
+    @staticmethod
+    def _ensure_ticket_channel_unique(cursor):
+        """La clé étrangère de ticket_members exige une clé UNIQUE sur tickets.channel_id
+        (MySQL 8.4 refuse une référence vers un simple index)."""
+        cursor.execute("""SELECT COUNT(*) FROM information_schema.STATISTICS s
+                          WHERE s.TABLE_SCHEMA = DATABASE() AND s.TABLE_NAME = 'tickets' AND s.NON_UNIQUE = 0
+                          AND s.COLUMN_NAME = 'channel_id'
+                          AND (SELECT COUNT(*) FROM information_schema.STATISTICS c WHERE c.TABLE_SCHEMA = s.TABLE_SCHEMA
+                               AND c.TABLE_NAME = s.TABLE_NAME AND c.INDEX_NAME = s.INDEX_NAME) = 1""")
+        if cursor.fetchone()[0]:
+            return
+        cursor.execute("SELECT channel_id FROM tickets GROUP BY channel_id HAVING COUNT(*) > 1 LIMIT 10")
+        duplicates = [row[0] for row in cursor.fetchall()]
+        if duplicates:
+            raise RuntimeError(f"tickets.channel_id contient des doublons ({', '.join(duplicates)}) : "
+                               f"impossible d'ajouter la clé UNIQUE requise par ticket_members")
+        cursor.execute("ALTER TABLE tickets ADD UNIQUE KEY uq_channel_id (channel_id)")
+        logging.info("Migration : clé UNIQUE ajoutée sur tickets.channel_id")
+
+    def migrate_ticket_members(self) -> int:
+        """Migration unique de l'ancienne colonne JSON tickets.members vers la table ticket_members.
+        Sans effet une fois la colonne supprimée. Lève une exception en cas d'échec : sans cette
+        table, aucun ticket ne peut être créé."""
+        def operation(connection):
+            cursor = connection.cursor()
+            try:
+                self._ensure_ticket_channel_unique(cursor)
+                cursor.execute(TICKET_MEMBERS_TABLE)
+                cursor.execute("""SELECT COUNT(*) FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE()
+                                  AND TABLE_NAME = 'tickets' AND COLUMN_NAME = 'members'""")
+                if not cursor.fetchone()[0]:
+                    return 0
+                cursor.execute("SELECT channel_id, owner_id, members FROM tickets")
+                rows = cursor.fetchall()
+                values = [(channel_id, int(member_id)) for channel_id, owner_id, raw in rows
+                          for member_id in (json.loads(raw) if raw else [owner_id])]
+                for start in range(0, len(values), MIGRATION_BATCH_SIZE):
+                    cursor.executemany("INSERT IGNORE INTO ticket_members (channel_id, member_id) VALUES (%s, %s)",
+                                       values[start:start + MIGRATION_BATCH_SIZE])
+                connection.commit()
+                cursor.execute("ALTER TABLE tickets DROP COLUMN members")
+                return len(values)
+            finally:
+                cursor.close()
+
+        try:
+            migrated = self._run(operation, idempotent=True)
+        except (mysql.connector.Error, RuntimeError) as e:
+            logging.error(f"Erreur migration membres ticket : {str(e)}")
+            raise
+        if migrated:
+            logging.info(f"Migration ticket_members : {migrated} membres copiés")
+        return migrated
+
+    def update_ticket_activity(self, owner_messages: Dict[str, datetime], staff_messages: Dict[str, datetime]) -> bool:
+        """Applique en un seul UPDATE les derniers horodatages propriétaire/staff de plusieurs tickets."""
+        channel_ids = list(set(owner_messages) | set(staff_messages))
+        if not channel_ids:
+            return True
+        try:
+            params = []
+            owner_value = "last_owner_message"
+            if owner_messages:
+                owner_value = f"CASE channel_id {' '.join(['WHEN %s THEN %s'] * len(owner_messages))} ELSE last_owner_message END"
+                for channel_id, timestamp in owner_messages.items():
+                    params.extend((channel_id, timestamp))
+            staff_value = "last_staff_message"
+            if staff_messages:
+                staff_value = f"CASE channel_id {' '.join(['WHEN %s THEN %s'] * len(staff_messages))} ELSE last_staff_message END"
+                for channel_id, timestamp in staff_messages.items():
+                    params.extend((channel_id, timestamp))
+            placeholders = ", ".join(["%s"] * len(channel_ids))
+            query = f"""UPDATE tickets SET last_owner_message = {owner_value}, last_staff_message = {staff_value}
+                        WHERE channel_id IN ({placeholders})"""
+            self._execute(query, tuple(params + channel_ids), idempotent=True)
             return True
         except mysql.connector.Error as e:
-            logging.error(f"Erreur mise à jour message propriétaire : {str(e)}")
+            logging.error(f"Erreur mise à jour activité tickets : {str(e)}")
             return False
-    
-    def update_ticket_staff_message(self, channel_id: str) -> bool:
-        try:
-            self.ensure_connection()
-            cursor = self.connection.cursor()
-            cursor.execute("UPDATE tickets SET last_staff_message = NOW() WHERE channel_id = %s", (channel_id,))
-            self.connection.commit()
-            cursor.close()
+
+    def set_ticket_autoclose(self, channel_id: str, autoclose_at: Optional[datetime]) -> bool:
+        try:
+            self._execute("UPDATE tickets SET autoclose_at = %s WHERE channel_id = %s", (autoclose_at, channel_id), idempotent=True)
             return True
         except mysql.connector.Error as e:
-            logging.error(f"Erreur mise à jour message staff : {str(e)}")
+            logging.error(f"Erreur mise à jour auto-close ticket : {str(e)}")
             return False
-    
+
     def claim_ticket(self, channel_id: str, staff_id: str) -> bool:
         try:
-            self.ensure_connection()
-            cursor = self.connection.cursor()
-            cursor.execute("UPDATE tickets SET claimed_by_id = %s WHERE channel_id = %s", (staff_id, channel_id))
-            self.connection.commit()
-            cursor.close()
+            self._execute("UPDATE tickets SET claimed_by_id = %s WHERE channel_id = %s", (staff_id, channel_id), idempotent=True)
             logging.info(f"Ticket {channel_id} réclamé par {staff_id}")
             return True
         except mysql.connector.Error as e:
             logging.error(f"Erreur claim ticket : {str(e)}")
             return False
-    
+
     def unclaim_ticket(self, channel_id: str) -> bool:
         try:
-            self.ensure_connection()
-            cursor = self.connection.cursor()
-            cursor.execute("UPDATE tickets SET claimed_by_id = NULL WHERE channel_id = %s", (channel_id,))
-            self.connection.commit()
-            cursor.close()
+            self._execute("UPDATE tickets SET claimed_by_id = NULL WHERE channel_id = %s", (channel_id,), idempotent=True)
             return True
         except mysql.connector.Error as e:
             logging.error(f"Erreur unclaim ticket : {str(e)}")
             return False
-    
+
     def add_ticket_member(self, channel_id: str, member_id: int) -> bool:
         try:
-            self.ensure_connection()
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT members FROM tickets WHERE channel_id = %s", (channel_id,))
-            result = cursor.fetchone()
-            if not result:
-                cursor.close()
-                return False
-            members = json.loads(result[0]) if result[0] else []
-            if member_id not in members:
-                members.append(member_id)
-                cursor.execute("UPDATE tickets SET members = %s WHERE channel_id = %s",
-                             (json.dumps(members), channel_id))
-                self.connection.commit()
-            cursor.close()
+            self._execute("INSERT IGNORE INTO ticket_members (channel_id, member_id) VALUES (%s, %s)",
+                          (channel_id, member_id))
             return True
         except mysql.connector.Error as e:
             logging.error(f"Erreur ajout membre ticket : {str(e)}")
             return False
-    
+
     def remove_ticket_member(self, channel_id: str, member_id: int) -> bool:
         try:
-            self.ensure_connection()
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT members FROM tickets WHERE channel_id = %s", (channel_id,))
-            result = cursor.fetchone()
-            if not result:
-                cursor.close()
-                return False
-            members = json.loads(result[0]) if result[0] else []
-            if member_id in members:
-                members.remove(member_id)
-                cursor.execute("UPDATE tickets SET members = %s WHERE channel_id = %s",
-                             (json.dumps(members), channel_id))
-                self.connection.commit()
-            cursor.close()
+            self._execute("DELETE FROM ticket_members WHERE channel_id = %s AND member_id = %s",
+                          (channel_id, member_id), idempotent=True)
             return True
         except mysql.connector.Error as e:
             logging.error(f"Erreur retrait membre ticket : {str(e)}")
             return False
-    
+
     def close_ticket(self, channel_id: str, closed_by_id: str, reason: str) -> bool:
         try:
-            self.ensure_connection()
-            cursor = self.connection.cursor()
-            query = """UPDATE tickets SET is_closed = TRUE, closed_at = NOW(), 
+            query = """UPDATE tickets SET is_closed = TRUE, closed_at = NOW(), autoclose_at = NULL,
                        closed_by_id = %s, close_reason = %s WHERE channel_id = %s"""
-            cursor.execute(query, (closed_by_id, reason, channel_id))
-            self.connection.commit()
-            cursor.close()
+            self._execute(query, (closed_by_id, reason, channel_id), idempotent=True)
             logging.info(f"Ticket {channel_id} fermé par {closed_by_id}")
             return True
         except mysql.connector.Error as e:
             logging.error(f"Erreur fermeture ticket : {str(e)}")
             return False
-    
+
     def reopen_ticket(self, channel_id: str) -> bool:
         try:
-            self.ensure_connection()
-            cursor = self.connection.cursor()
             query = """UPDATE tickets SET is_closed = FALSE, closed_at = NULL,
                        closed_by_id = NULL, close_reason = NULL WHERE channel_id = %s"""
-            cursor.execute(query, (channel_id,))
-            self.connection.commit()
-            cursor.close()
+            self._execute(query, (channel_id,), idempotent=True)
             logging.info(f"Ticket {channel_id} réouvert")
             return True
         except mysql.connector.Error as e:
@@ -376,60 +681,160 @@ class Database:
 
     def delete_ticket(self, channel_id: str) -> bool:
         try:
-            self.ensure_connection()
-            cursor = self.connection.cursor()
-            cursor.execute("DELETE FROM tickets WHERE channel_id = %s", (channel_id,))
-            self.connection.commit()
-            cursor.close()
+            self._execute("DELETE FROM tickets WHERE channel_id = %s", (channel_id,), idempotent=True)
             logging.info(f"Ticket {channel_id} supprimé de la BDD")
             return True
         except mysql.connector.Error as e:
             logging.error(f"Erreur suppression ticket : {str(e)}")
             return False
-    
+
+    def get_tickets_to_archive(self, server_id: str, closed_before: datetime, limit: int = 50) -> List[str]:
+        """Canaux des tickets fermés avant closed_before et pas encore archivés, du plus ancien au plus récent."""
+        try:
+            query = """SELECT channel_id FROM tickets
+                       WHERE server_id = %s AND is_closed = TRUE AND archived_at IS NULL AND closed_at <= %s
+                       ORDER BY closed_at LIMIT %s"""
+            return [row[0] for row in self._fetchall(query, (server_id, closed_before, limit))]
+        except mysql.connector.Error as e:
+            logging.error(f"Erreur récupération tickets à archiver : {str(e)}")
+            return []
+
+    def mark_ticket_archived(self, channel_id: str) -> bool:
+        try:
+            self._execute("UPDATE tickets SET archived_at = NOW() WHERE channel_id = %s", (channel_id,), idempotent=True)
+            logging.info(f"Ticket {channel_id} archivé")
+            return True
+        except mysql.connector.Error as e:
+            logging.error(f"Erreur archivage ticket : {str(e)}")
+            return False
+
+    def get_closed_ticket_channels(self, server_id: str) -> List[int]:
+        """Canaux des tickets fermés pas encore archivés (leurs messages restent journalisés)."""
+        try:
+            rows = self._fetchall("SELECT channel_id FROM tickets WHERE server_id = %s AND is_closed = TRUE AND archived_at IS NULL",
+                                  (server_id,))
+            return [int(row[0]) for row in rows]
+        except mysql.connector.Error as e:
+            logging.error(f"Erreur récupération canaux des tickets fermés : {str(e)}")
+            return []
+
     def get_all_tickets(self, server_id: str, is_closed: bool = False) -> List[Dict]:
         try:
-            self.ensure_connection()
-            cursor = self.connection.cursor(dictionary=True)
             query = "SELECT * FROM tickets WHERE server_id = %s AND is_closed = %s"
-            cursor.execute(query, (server_id, is_closed))
-            results = cursor.fetchall()
-            cursor.close()
-            for result in results:
-                if result.get('members'):
-                    result['members'] = json.loads(result['members'])
-            return results
+            return self._fetchall(query, (server_id, is_closed), dictionary=True)
         except mysql.connector.Error as e:
             logging.error(f"Erreur récupération tous tickets : {str(e)}")
             return []
-    
+
     def set_config(self, server_id: str, config_key: str, config_value: str) -> bool:
         try:
-            self.ensure_connection()
-            cursor = self.connection.cursor()
             query = """INSERT INTO configurations (server_id, config_key, config_value)
                        VALUES (%s, %s, %s)
                        ON DUPLICATE KEY UPDATE config_value = %s, updated_at = CURRENT_TIMESTAMP"""
-            cursor.execute(query, (server_id, config_key, config_value, config_value))
-            self.connection.commit()
-            cursor.close()
+            self._execute(query, (server_id, config_key, config_value, config_value), idempotent=True)
             logging.info(f"Configuration {config_key} définie pour le serveur {server_id}")
             return True
         except mysql.connector.Error as e:
             logging.error(f"Erreur définition configuration : {str(e)}")
             return False
-    
+
     def get_config(self, server_id: str, config_key: str) -> Optional[str]:
         try:
-            self.ensure_connection()
-            cursor = self.connection.cursor()
-            cursor.execute("SELECT config_value FROM configurations WHERE server_id = %s AND config_key = %s",
-                         (server_id, config_key))
-            result = cursor.fetchone()
-            cursor.close()
+            result = self._fetchone("SELECT config_value FROM configurations WHERE server_id = %s AND config_key = %s",
+                                    (server_id, config_key))
             return result[0] if result else None
         except mysql.connector.Error as e:
             logging.error(f"Erreur récupération configuration : {str(e)}")
             return None
 
+
+class AsyncDatabase:
+    """Variante asynchrone de Database.
+
+    Chaque méthode de Database est exposée sous forme de coroutine exécutée dans un
+    pool de threads borné à la taille du pool MySQL, pour ne jamais bloquer la boucle
+    asyncio. `stats()` expose la taille du pool, l'attente et les requêtes en cours.
+    """
+
+    def __init__(self, database: Database):
+        self.database = database
+        self.pool_size = database.pool_size
+        self.keepalive_interval = float(os.getenv("DB_KEEPALIVE_INTERVAL", "300"))
+        self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="db")
+        self._keepalive_task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._in_flight = 0
+        self._total_queries = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def __getattr__(self, name: str):
+        attribute = getattr(self.database, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        async def call(*args, **kwargs):
+            return await self.run(attribute, *args, **kwargs)
+
+        return call
+
+    async def run(self, func, *args, **kwargs):
+        if self._keepalive_task is None and self.keepalive_interval > 0:
+            self._keepalive_task = asyncio.create_task(self._keepalive_loop())
+
+        submitted_at = time.perf_counter()
+        with self._lock:
+            self._waiting += 1
+
+        def job():
+            wait = time.perf_counter() - submitted_at
+            with self._lock:
+                self._waiting -= 1
+                self._in_flight += 1
+                self._total_queries += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, job)
+
+    async def _keepalive_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            try:
+                await loop.run_in_executor(self._executor, self.database.keepalive, self.keepalive_interval)
+            except Exception as e:
+                logging.error(f"Erreur keepalive base de données : {str(e)}")
+            # Attente et requêtes en cours, pour dimensionner DB_POOL_SIZE
+            logging.info(f"Pool base de données : {self.stats()}")
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = {
+                "pool_size": self.pool_size,
+                "in_flight": self._in_flight,
+                "waiting": self._waiting,
+                "calls": self._total_queries,
+                "avg_wait_ms": round(self._total_wait / self._total_queries * 1000, 3) if self._total_queries else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 3),
+            }
+        stats.update(self.database.stats())
+        return stats
+
+    def close(self):
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+        self._executor.shutdown(wait=True)
+        self.database.close()
+
+
 db = Database()
+async_db = AsyncDatabase(db)
@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from modules.Database import async_db
+
+
+class ParticipantStore:
+    """Participants des giveaways actifs en mémoire, persistés en write-behind.
+
+    Chaque inscription/désinscription est d'abord ajoutée à un journal (une ligne par
+    opération) puis appliquée à la BDD par lots. Au flush, le journal courant est renommé
+    en segment numéroté et n'est supprimé qu'une fois le lot validé en BDD ; au démarrage,
+    recover() rejoue les segments et le journal restés sur disque après un arrêt brutal.
+    """
+
+    def __init__(self, journal_path: str, flush_interval: float = 2):
+        self.journal_path = Path(journal_path)
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self.logger = logging.getLogger("GiveawayParticipants")
+        self.sets: Dict[str, Set[int]] = {}
+        self.loading: Dict[str, asyncio.Future] = {}
+        # (giveaway_id, user_id) -> True (inscrit) / False (désinscrit), seule la dernière opération compte
+        self.pending: Dict[Tuple[str, int], bool] = {}
+        self.flush_lock = asyncio.Lock()
+        self.flush_task: Optional[asyncio.Task] = None
+        self._journal = None
+
+    def _segments(self) -> List[Path]:
+        segments = []
+        for path in self.journal_path.parent.glob(f"{self.journal_path.name}.*"):
+            suffix = path.name[len(self.journal_path.name) + 1:]
+            if suffix.isdigit():
+                segments.append((int(suffix), path))
+        return [path for _, path in sorted(segments)]
+
+    @staticmethod
+    def _read_operations(paths: List[Path]) -> Dict[Tuple[str, int], bool]:
+        operations: Dict[Tuple[str, int], bool] = {}
+        for path in paths:
+            with path.open("r", encoding="utf-8") as f:
+                for line in f:
+                    parts = line.split()
+                    if len(parts) != 3 or parts[0] not in "+-":
+                        continue  # Dernière ligne tronquée par un arrêt brutal
+                    operations[(parts[1], int(parts[2]))] = parts[0] == "+"
+        return operations
+
+    async def recover(self):
+        """Rejoue les opérations journalisées qui n'ont peut-être pas atteint la BDD."""
+        paths = self._segments()
+        if self.journal_path.exists():
+            paths.append(self.journal_path)
+        if not paths:
+            return
+        self._close_journal()
+        operations = self._read_operations(paths)
+        for key, joined in operations.items():
+            self.pending.setdefault(key, joined)
+        self.logger.info(f"{len(operations)} opérations de participation récupérées depuis le journal")
+        await self.flush()
+
+    def start(self):
+        if self.flush_task is None or self.flush_task.done():
+            self.flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        if self.flush_task is not None:
+            self.flush_task.cancel()
+            self.flush_task = None
+        await self.flush()
+        self._close_journal()
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def _close_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def _record(self, giveaway_id: str, user_id: int, joined: bool):
+        if self._journal is None:
+            # Tamponné par ligne : chaque opération atteint le système de fichiers immédiatement
+            self._journal = self.journal_path.open("a", encoding="utf-8", buffering=1)
+        self._journal.write(f"{'+' if joined else '-'} {giveaway_id} {user_id}\n")
+        self.pending[(giveaway_id, user_id)] = joined
+
+    async def flush(self) -> bool:
+        async with self.flush_lock:
+            if not self.pending:
+                return True
+            operations, self.pending = self.pending, {}
+
+            # Les nouvelles opérations partent dans un journal neuf pendant l'écriture du lot
+            self._close_journal()
+            segments = self._segments()
+            if self.journal_path.exists():
+                next_index = int(segments[-1].name.rsplit(".", 1)[1]) + 1 if segments else 0
+                segment = self.journal_path.with_name(f"{self.journal_path.name}.{next_index}")
+                os.replace(self.journal_path, segment)
+                segments.append(segment)
+
+            added = [key for key, joined in operations.items() if joined]
+            removed = [key for key, joined in operations.items() if not joined]
+            try:
+                success = await async_db.apply_participant_changes(added, removed)
+            except Exception as e:
+                self.logger.error(f"Erreur écriture participants: {e}")
+                success = False
+
+            if not success:
+                # Les segments restent sur disque ; on remet en attente sans écraser une opération plus récente
+                for key, joined in operations.items():
+                    self.pending.setdefault(key, joined)
+                return False
+
+            for segment in segments:
+                segment.unlink(missing_ok=True)
+            return True
+
+    async def get(self, giveaway_id: str) -> Optional[Set[int]]:
+        """Ensemble des participants (chargé depuis la BDD au premier accès), None en cas d'erreur."""
+        participants = self.sets.get(giveaway_id)
+        if participants is not None:
+            return participants
+
+        # Plusieurs clics simultanés sur un giveaway pas encore chargé partagent la même requête
+        future = self.loading.get(giveaway_id)
+        if future is None:
+            future = asyncio.ensure_future(async_db.load_participants(giveaway_id))
+            self.loading[giveaway_id] = future
+            future.add_done_callback(lambda _: self.loading.pop(giveaway_id, None))
+        rows = await asyncio.shield(future)
+        if rows is None:
+            return None
+
+        participants = self.sets.get(giveaway_id)
+        if participants is None:
+            participants = set(rows)
+            for (pending_giveaway_id, user_id), joined in self.pending.items():
+                if pending_giveaway_id == giveaway_id:
+                    if joined:
+                        participants.add(user_id)
+                    else:
+                        participants.discard(user_id)
+            self.sets[giveaway_id] = participants
+        return participants
+
+    async def join(self, giveaway_id: str, user_id: int) -> Optional[bool]:
+        """True si inscrit, False si déjà inscrit, None en cas d'erreur."""
+        participants = await self.get(giveaway_id)
+        if participants is None:
+            return None
+        if user_id in participants:
+            return False
+        participants.add(user_id)
+        self._record(giveaway_id, user_id, True)
+        return True
+
+    async def leave(self, giveaway_id: str, user_id: int) -> Optional[bool]:
+        """True si désinscrit, False si non inscrit, None en cas d'erreur."""
+        participants = await self.get(giveaway_id)
+        if participants is None:
+            return None
+        if user_id not in participants:
+            return False
+        participants.discard(user_id)
+        self._record(giveaway_id, user_id, False)
+        return True
+
+    async def members(self, giveaway_id: str) -> Optional[List[int]]:
+        participants = await self.get(giveaway_id)
+        return list(participants) if participants is not None else None
+
+    def count(self, giveaway_id: str) -> int:
+        return len(self.sets.get(giveaway_id, ()))
+
+    def forget(self, giveaway_id: str):
+        """Libère la mémoire d'un giveaway terminé (les opérations en attente restent à écrire)."""
+        self.sets.pop(giveaway_id, None)
+
+    def discard(self, giveaway_id: str):
+        """Giveaway supprimé : plus rien à écrire pour lui."""
+        self.sets.pop(giveaway_id, None)
+        for key in [key for key in self.pending if key[0] == giveaway_id]:
+            del self.pending[key]
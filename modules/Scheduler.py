@@ -0,0 +1,100 @@
+import asyncio
+import heapq
+import itertools
+import logging
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+
+class DeadlineScheduler:
+    """Planificateur d'échéances : un tas (échéance, clé) et une seule boucle de réveil.
+
+    Reprogrammer ou annuler une clé est en O(log n) : l'ancienne entrée reste dans le tas
+    et est ignorée lorsqu'elle remonte au sommet.
+    """
+
+    def __init__(self, name: str = "DeadlineScheduler"):
+        self.logger = logging.getLogger(name)
+        self._heap: List[Tuple[datetime, int, Hashable]] = []
+        self._entries: Dict[Hashable, Tuple[datetime, int]] = {}
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+        self._callback: Optional[Callable[[Hashable], Awaitable[None]]] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable) -> Optional[datetime]:
+        entry = self._entries.get(key)
+        return entry[0] if entry else None
+
+    def schedule(self, key: Hashable, deadline: datetime):
+        sequence = next(self._counter)
+        self._entries[key] = (deadline, sequence)
+        heapq.heappush(self._heap, (deadline, sequence, key))
+        if self._heap[0][1] == sequence:
+            self._wakeup.set()
+        self._compact()
+
+    def cancel(self, key: Hashable) -> bool:
+        return self._entries.pop(key, None) is not None
+
+    def start(self, callback: Callable[[Hashable], Awaitable[None]]):
+        self._callback = callback
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for task in self._running:
+            task.cancel()
+
+    def _is_stale(self, entry: Tuple[datetime, int, Hashable]) -> bool:
+        current = self._entries.get(entry[2])
+        return current is None or current[1] != entry[1]
+
+    def _compact(self):
+        # Évite que les entrées périmées ne fassent grossir le tas indéfiniment
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._entries):
+            self._heap = [entry for entry in self._heap if not self._is_stale(entry)]
+            heapq.heapify(self._heap)
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            while self._heap and self._is_stale(self._heap[0]):
+                heapq.heappop(self._heap)
+
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            deadline, _, key = self._heap[0]
+            delay = (deadline - datetime.now()).total_seconds()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            heapq.heappop(self._heap)
+            del self._entries[key]
+            task = asyncio.create_task(self._fire(key))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _fire(self, key: Hashable):
+        try:
+            await self._callback(key)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.logger.error(f"Erreur échéance {key}: {e}")
@@ -1,11 +1,24 @@
 import asyncio
 import logging
-from datetime import datetime
-from typing import Optional, Dict, List
-from modules.Database import db
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional, Dict, List, Set
+from config import Config
+from modules.Database import async_db
+from modules.Scheduler import DeadlineScheduler
 
 
 class TicketData:
+    # Pas de __dict__ par instance ; les membres sont un tableau trié d'entiers 64 bits
+    __slots__ = (
+        "channel_id", "owner_id", "type_key", "server_id", "created_at", "claimed_by_id",
+        "last_owner_message", "last_staff_message", "_members", "is_closed", "autoclose_at"
+    )
+
     def __init__(
         self,
         channel_id: int,
@@ -18,19 +31,45 @@ class TicketData:
         last_staff_message: Optional[datetime] = None,
         members: List[int] = None,
         is_closed: bool = False,
-        autoclose_task: Optional[asyncio.Task] = None
+        autoclose_at: Optional[datetime] = None
     ):
         self.channel_id = channel_id
         self.owner_id = owner_id
-        self.type_key = type_key
-        self.server_id = server_id
+        self.type_key = sys.intern(type_key)
+        self.server_id = sys.intern(server_id)
         self.created_at = created_at or datetime.now()
         self.claimed_by_id = claimed_by_id
         self.last_owner_message = last_owner_message or datetime.now()
         self.last_staff_message = last_staff_message
-        self.members: List[int] = members if members else [owner_id]
+        self._members = array("Q", sorted(set(members or [owner_id])))
         self.is_closed = is_closed
-        self.autoclose_task: Optional[asyncio.Task] = autoclose_task
+        self.autoclose_at = autoclose_at
+
+    @property
+    def members(self) -> List[int]:
+        return self._members.tolist()
+
+    def add_member(self, member_id: int) -> bool:
+        index = bisect_left(self._members, member_id)
+        if index < len(self._members) and self._members[index] == member_id:
+            return False
+        self._members.insert(index, member_id)
+        return True
+
+    def remove_member(self, member_id: int) -> bool:
+        index = bisect_left(self._members, member_id)
+        if index < len(self._members) and self._members[index] == member_id:
+            del self._members[index]
+            return True
+        return False
+
+    def memory_size(self) -> int:
+        """Taille approximative en octets (objet, membres et horodatages)."""
+        size = sys.getsizeof(self) + sys.getsizeof(self._members)
+        for value in (self.created_at, self.last_owner_message, self.last_staff_message, self.autoclose_at):
+            if value is not None:
+                size += sys.getsizeof(value)
+        return size
 
     @classmethod
     def from_db(cls, data: dict) -> "TicketData":
@@ -43,29 +82,179 @@ class TicketData:
             claimed_by_id=int(data["claimed_by_id"]) if data.get("claimed_by_id") else None,
             last_owner_message=data.get("last_owner_message"),
             last_staff_message=data.get("last_staff_message"),
-            members=data.get("members", [int(data["owner_id"])]),
-            is_closed=data.get("is_closed", False)
+            members=data.get("members") or [int(data["owner_id"])],
+            is_closed=data.get("is_closed", False),
+            autoclose_at=data.get("autoclose_at")
         )
 
 
 class TicketManager:
+    NEGATIVE_CACHE_SIZE = 4096
+
     def __init__(self, bot):
         self.bot = bot
         self.tickets: Dict[int, TicketData] = {}
         self.logger = logging.getLogger("TicketManager")
-        self.autoclose_delays: Dict[int, asyncio.Task] = {}
+        # Une fois chargé, self.tickets fait foi pour les tickets ouverts : get_ticket ne touche plus la BDD.
+        self.loaded = False
+        # Canaux connus pour ne pas être des tickets (LRU borné), invalidé à la création/réouverture
+        self.negative_cache: "OrderedDict[int, None]" = OrderedDict()
+        # Un seul tas d'échéances pour tous les auto-close, persisté dans tickets.autoclose_at
+        self.autoclose_scheduler = DeadlineScheduler("TicketAutoclose")
+        # Write-behind des horodatages d'activité : seul le dernier par canal est conservé
+        # et écrit en un UPDATE groupé. Les TicketData en mémoire restent la référence.
+        self.activity_flush_interval = getattr(Config, "TicketActivityFlushInterval", 5)
+        self.pending_owner_messages: Dict[int, datetime] = {}
+        self.pending_staff_messages: Dict[int, datetime] = {}
+        self.activity_flush_task: Optional[asyncio.Task] = None
+        # Index secondaires des tickets ouverts (clé -> ids de canaux), tenus à jour à chaque transition
+        self.by_owner: Dict[int, Set[int]] = {}
+        self.by_claimer: Dict[int, Set[int]] = {}
+        self.by_type: Dict[str, Set[int]] = {}
+        # Les tickets fermés ne restent en mémoire que temporairement (LRU borné + TTL)
+        self.closed_cache_size = getattr(Config, "TicketClosedCacheSize", 500)
+        self.closed_cache_ttl = getattr(Config, "TicketClosedCacheTTL", 3600)
+        self.closed_order: "OrderedDict[int, float]" = OrderedDict()
+        # Canaux de tickets fermés absents de la mémoire (évincés ou fermés avant le démarrage) :
+        # leurs messages continuent d'alimenter le journal de transcription jusqu'à l'archivage
+        self.closed_channel_ids: Set[int] = set()
+
+    @staticmethod
+    def _index_add(index: Dict, key, channel_id: int):
+        if key is not None:
+            index.setdefault(key, set()).add(channel_id)
+
+    @staticmethod
+    def _index_remove(index: Dict, key, channel_id: int):
+        channel_ids = index.get(key)
+        if channel_ids is not None:
+            channel_ids.discard(channel_id)
+            if not channel_ids:
+                del index[key]
+
+    def _index(self, ticket: TicketData):
+        if ticket.is_closed:
+            return
+        self._index_add(self.by_owner, ticket.owner_id, ticket.channel_id)
+        self._index_add(self.by_claimer, ticket.claimed_by_id, ticket.channel_id)
+        self._index_add(self.by_type, ticket.type_key, ticket.channel_id)
+
+    def _unindex(self, ticket: TicketData):
+        self._index_remove(self.by_owner, ticket.owner_id, ticket.channel_id)
+        self._index_remove(self.by_claimer, ticket.claimed_by_id, ticket.channel_id)
+        self._index_remove(self.by_type, ticket.type_key, ticket.channel_id)
+
+    def _store(self, ticket: TicketData):
+        previous = self.tickets.get(ticket.channel_id)
+        if previous is not None:
+            self._unindex(previous)
+        self.tickets[ticket.channel_id] = ticket
+        self._index(ticket)
+
+    def _tickets_from_index(self, index: Dict, key, server_id: Optional[str] = None) -> List[TicketData]:
+        tickets = (self.tickets[channel_id] for channel_id in index.get(key, ()))
+        return [ticket for ticket in tickets if server_id is None or ticket.server_id == server_id]
+
+    def start_activity_flush(self):
+        if self.activity_flush_task is None or self.activity_flush_task.done():
+            self.activity_flush_task = asyncio.create_task(self._activity_flush_loop())
+
+    async def stop_activity_flush(self):
+        if self.activity_flush_task is not None:
+            self.activity_flush_task.cancel()
+            self.activity_flush_task = None
+        await self.flush_activity()
+
+    async def _activity_flush_loop(self):
+        while True:
+            await asyncio.sleep(self.activity_flush_interval)
+            await self.flush_activity()
+            self.evict_closed()
+
+    def _mark_closed(self, channel_id: int):
+        self.closed_order[channel_id] = time.monotonic()
+        self.closed_order.move_to_end(channel_id)
+        self.evict_closed()
+
+    def evict_closed(self) -> int:
+        """Retire de la mémoire les tickets fermés trop anciens ou en surnombre.
+        Ils restent accessibles via lookup_ticket (BDD)."""
+        evicted = 0
+        now = time.monotonic()
+        while self.closed_order:
+            channel_id, closed_at = next(iter(self.closed_order.items()))
+            if len(self.closed_order) <= self.closed_cache_size and now - closed_at < self.closed_cache_ttl:
+                break
+            self.closed_order.popitem(last=False)
+            ticket = self.tickets.get(channel_id)
+            if ticket is not None and ticket.is_closed:
+                self.forget_ticket(channel_id)
+                self.closed_channel_ids.add(channel_id)
+                evicted += 1
+        if evicted:
+            self.logger.info(f"{evicted} tickets fermés retirés de la mémoire ({self.memory_report()['approx_bytes']} octets restants)")
+        return evicted
+
+    def forget_ticket(self, channel_id: int):
+        """Retire un ticket de la mémoire sans toucher à la BDD (éviction, archivage)."""
+        ticket = self.tickets.pop(channel_id, None)
+        if ticket is not None:
+            self._unindex(ticket)
+        self.closed_order.pop(channel_id, None)
+        self.closed_channel_ids.discard(channel_id)
+        self.pending_owner_messages.pop(channel_id, None)
+        self.pending_staff_messages.pop(channel_id, None)
+        self.autoclose_scheduler.cancel(channel_id)
+
+    def memory_report(self) -> Dict[str, int]:
+        open_tickets = self.count_open_tickets()
+        index_entries = sum(len(ids) for index in (self.by_owner, self.by_claimer, self.by_type) for ids in index.values())
+        approx_bytes = sys.getsizeof(self.tickets) + sum(ticket.memory_size() for ticket in self.tickets.values())
+        approx_bytes += sum(sys.getsizeof(index) for index in (self.by_owner, self.by_claimer, self.by_type))
+        approx_bytes += sys.getsizeof(self.negative_cache) + sys.getsizeof(self.closed_order)
+        return {
+            "open_tickets": open_tickets,
+            "closed_tickets": len(self.tickets) - open_tickets,
+            "index_entries": index_entries,
+            "negative_cache": len(self.negative_cache),
+            "scheduled_autocloses": len(self.autoclose_scheduler),
+            "approx_bytes": approx_bytes,
+        }
+
+    async def flush_activity(self):
+        if not self.pending_owner_messages and not self.pending_staff_messages:
+            return
+        owner_messages, self.pending_owner_messages = self.pending_owner_messages, {}
+        staff_messages, self.pending_staff_messages = self.pending_staff_messages, {}
+        try:
+            success = await async_db.update_ticket_activity(
+                {str(channel_id): timestamp for channel_id, timestamp in owner_messages.items()},
+                {str(channel_id): timestamp for channel_id, timestamp in staff_messages.items()}
+            )
+        except Exception as e:
+            self.logger.error(f"Erreur écriture activité tickets: {e}")
+            success = False
+        if not success:
+            # On remet en attente sans écraser un horodatage plus récent arrivé entre-temps
+            for channel_id, timestamp in owner_messages.items():
+                self.pending_owner_messages.setdefault(channel_id, timestamp)
+            for channel_id, timestamp in staff_messages.items():
+                self.pending_staff_messages.setdefault(channel_id, timestamp)
         
     async def load_from_db(self, server_id: str):
         try:
-            tickets_data = db.get_all_tickets(server_id, is_closed=False)
+            tickets_data = await async_db.get_all_tickets(server_id, is_closed=False)
+            members_by_channel = await async_db.get_ticket_members_by_server(server_id, is_closed=False)
             for ticket_data in tickets_data:
-                ticket = TicketData.from_db(ticket_data)
-                self.tickets[ticket.channel_id] = ticket
+                ticket_data["members"] = members_by_channel.get(ticket_data["channel_id"]) or [int(ticket_data["owner_id"])]
+                self._store(TicketData.from_db(ticket_data))
+            self.closed_channel_ids.update(await async_db.get_closed_ticket_channels(server_id))
+            self.loaded = True
             self.logger.info(f"Chargé {len(tickets_data)} tickets depuis la BDD pour le serveur {server_id}")
         except Exception as e:
             self.logger.error(f"Erreur chargement tickets: {e}")
 
-    def create_ticket(
+    async def create_ticket(
         self,
         server_id: str,
         channel_id: int,
@@ -73,7 +262,7 @@ class TicketManager:
         type_key: str
     ) -> Optional[TicketData]:
         try:
-            ticket_id = db.create_ticket(
+            ticket_id = await async_db.create_ticket(
                 server_id=server_id,
                 channel_id=str(channel_id),
                 owner_id=str(owner_id),
@@ -91,66 +280,117 @@ class TicketManager:
                 server_id=server_id,
                 created_at=datetime.now()
             )
-            self.tickets[channel_id] = ticket
+            self._store(ticket)
+            self.negative_cache.pop(channel_id, None)
             self.logger.info(f"Ticket créé: canal {channel_id}, propriétaire {owner_id}, type {type_key}")
             return ticket
         except Exception as e:
             self.logger.error(f"Erreur création ticket: {e}")
             return None
 
-    def get_ticket(self, channel_id: int) -> Optional[TicketData]:
+    def _remember_missing(self, channel_id: int):
+        self.negative_cache[channel_id] = None
+        self.negative_cache.move_to_end(channel_id)
+        while len(self.negative_cache) > self.NEGATIVE_CACHE_SIZE:
+            self.negative_cache.popitem(last=False)
+
+    def _is_known_missing(self, channel_id: int) -> bool:
+        if channel_id in self.negative_cache:
+            self.negative_cache.move_to_end(channel_id)
+            return True
+        return False
+
+    async def get_ticket(self, channel_id: int) -> Optional[TicketData]:
         if channel_id in self.tickets:
             return self.tickets[channel_id]
-        
+
+        if self.loaded or self._is_known_missing(channel_id):
+            return None
+
+        # Chargement initial échoué : repli sur la BDD
         try:
-            ticket_data = db.get_ticket_by_channel(str(channel_id))
+            ticket_data = await async_db.get_ticket_by_channel(str(channel_id))
             if ticket_data and not ticket_data.get("is_closed"):
                 ticket = TicketData.from_db(ticket_data)
-                self.tickets[channel_id] = ticket
+                self._store(ticket)
                 return ticket
+            if not ticket_data:
+                self._remember_missing(channel_id)
         except Exception as e:
             self.logger.error(f"Erreur récupération ticket: {e}")
         
         return None
 
-    def delete_ticket(self, channel_id: int):
+    async def lookup_ticket(self, channel_id: int) -> Optional[TicketData]:
+        """Comme get_ticket mais inclut les tickets fermés absents de la mémoire."""
+        if channel_id in self.tickets:
+            return self.tickets[channel_id]
+
+        if self._is_known_missing(channel_id):
+            return None
+
+        try:
+            ticket_data = await async_db.get_ticket_by_channel(str(channel_id))
+            if ticket_data:
+                return TicketData.from_db(ticket_data)
+            self._remember_missing(channel_id)
+        except Exception as e:
+            self.logger.error(f"Erreur récupération ticket: {e}")
+
+        return None
+
+    async def delete_ticket(self, channel_id: int):
         try:
-            if channel_id in self.autoclose_delays:
-                self.autoclose_delays[channel_id].cancel()
-                del self.autoclose_delays[channel_id]
+            self.autoclose_scheduler.cancel(channel_id)
             
-            db.delete_ticket(str(channel_id))
+            await async_db.delete_ticket(str(channel_id))
             
-            if channel_id in self.tickets:
-                del self.tickets[channel_id]
+            ticket = self.tickets.pop(channel_id, None)
+            if ticket is not None:
+                self._unindex(ticket)
+            self.closed_order.pop(channel_id, None)
+            self.closed_channel_ids.discard(channel_id)
             
             self.logger.info(f"Ticket supprimé: canal {channel_id}")
         except Exception as e:
             self.logger.error(f"Erreur suppression ticket: {e}")
 
-    def close_ticket(self, channel_id: int, closed_by_id: int, reason: str = "Aucune raison"):
+    async def close_ticket(self, channel_id: int, closed_by_id: int, reason: str = "Aucune raison"):
         try:
-            db.close_ticket(str(channel_id), str(closed_by_id), reason)
+            await async_db.close_ticket(str(channel_id), str(closed_by_id), reason)
             
+            self.autoclose_scheduler.cancel(channel_id)
             if channel_id in self.tickets:
-                self.tickets[channel_id].is_closed = True
+                ticket = self.tickets[channel_id]
+                self._unindex(ticket)
+                ticket.is_closed = True
+                ticket.autoclose_at = None
+                self._mark_closed(channel_id)
+            else:
+                self.closed_channel_ids.add(channel_id)
             
             self.logger.info(f"Ticket fermé: canal {channel_id}")
         except Exception as e:
             self.logger.error(f"Erreur fermeture ticket: {e}")
 
-    def reopen_ticket(self, channel_id: int) -> Optional["TicketData"]:
+    async def reopen_ticket(self, channel_id: int) -> Optional["TicketData"]:
         try:
-            db.reopen_ticket(str(channel_id))
+            await async_db.reopen_ticket(str(channel_id))
+            self.negative_cache.pop(channel_id, None)
+            self.closed_channel_ids.discard(channel_id)
 
             if channel_id in self.tickets:
-                self.tickets[channel_id].is_closed = False
-                return self.tickets[channel_id]
+                ticket = self.tickets[channel_id]
+                ticket.is_closed = False
+                self.closed_order.pop(channel_id, None)
+                self._index(ticket)
+                return ticket
 
-            ticket_data = db.get_ticket_by_channel(str(channel_id))
+            ticket_data = await async_db.get_ticket_by_channel(str(channel_id))
             if ticket_data:
                 ticket = TicketData.from_db(ticket_data)
-                self.tickets[channel_id] = ticket
+                ticket.is_closed = False
+                self._store(ticket)
                 return ticket
 
             return None
@@ -158,79 +398,126 @@ class TicketManager:
             self.logger.error(f"Erreur réouverture ticket: {e}")
             return None
 
-    def is_ticket_channel(self, channel_id: int) -> bool:
-        return self.get_ticket(channel_id) is not None
+    async def is_ticket_channel(self, channel_id: int) -> bool:
+        return await self.get_ticket(channel_id) is not None
+
+    def is_journaled(self, channel_id: int) -> bool:
+        """Vrai pour tout canal de ticket non archivé, ouvert ou fermé, même évincé de la mémoire."""
+        return channel_id in self.tickets or channel_id in self.closed_channel_ids
 
     def update_owner_message_time(self, channel_id: int):
-        try:
-            db.update_ticket_owner_message(str(channel_id))
-            if channel_id in self.tickets:
-                self.tickets[channel_id].last_owner_message = datetime.now()
-        except Exception as e:
-            self.logger.error(f"Erreur mise à jour message propriétaire: {e}")
+        now = datetime.now()
+        self.pending_owner_messages[channel_id] = now
+        if channel_id in self.tickets:
+            self.tickets[channel_id].last_owner_message = now
 
     def update_staff_message_time(self, channel_id: int):
-        try:
-            db.update_ticket_staff_message(str(channel_id))
-            if channel_id in self.tickets:
-                self.tickets[channel_id].last_staff_message = datetime.now()
-        except Exception as e:
-            self.logger.error(f"Erreur mise à jour message staff: {e}")
+        now = datetime.now()
+        self.pending_staff_messages[channel_id] = now
+        if channel_id in self.tickets:
+            self.tickets[channel_id].last_staff_message = now
 
-    def claim_ticket(self, channel_id: int, staff_id: int):
+    async def claim_ticket(self, channel_id: int, staff_id: int):
         try:
-            db.claim_ticket(str(channel_id), str(staff_id))
+            await async_db.claim_ticket(str(channel_id), str(staff_id))
             if channel_id in self.tickets:
-                self.tickets[channel_id].claimed_by_id = staff_id
+                ticket = self.tickets[channel_id]
+                self._unindex(ticket)
+                ticket.claimed_by_id = staff_id
+                self._index(ticket)
             self.logger.info(f"Ticket {channel_id} réclamé par {staff_id}")
         except Exception as e:
             self.logger.error(f"Erreur claim ticket: {e}")
 
-    def unclaim_ticket(self, channel_id: int):
+    async def unclaim_ticket(self, channel_id: int):
         try:
-            db.unclaim_ticket(str(channel_id))
+            await async_db.unclaim_ticket(str(channel_id))
             if channel_id in self.tickets:
-                self.tickets[channel_id].claimed_by_id = None
+                ticket = self.tickets[channel_id]
+                self._unindex(ticket)
+                ticket.claimed_by_id = None
+                self._index(ticket)
             self.logger.info(f"Ticket {channel_id} non réclamé")
         except Exception as e:
             self.logger.error(f"Erreur unclaim ticket: {e}")
 
-    def add_ticket_member(self, channel_id: int, member_id: int):
+    async def add_ticket_member(self, channel_id: int, member_id: int):
         try:
-            db.add_ticket_member(str(channel_id), member_id)
-            if channel_id in self.tickets and member_id not in self.tickets[channel_id].members:
-                self.tickets[channel_id].members.append(member_id)
+            await async_db.add_ticket_member(str(channel_id), member_id)
+            if channel_id in self.tickets:
+                self.tickets[channel_id].add_member(member_id)
             self.logger.info(f"Membre {member_id} ajouté au ticket {channel_id}")
         except Exception as e:
             self.logger.error(f"Erreur ajout membre: {e}")
 
-    def remove_ticket_member(self, channel_id: int, member_id: int):
+    async def remove_ticket_member(self, channel_id: int, member_id: int):
         try:
-            db.remove_ticket_member(str(channel_id), member_id)
-            if channel_id in self.tickets and member_id in self.tickets[channel_id].members:
-                self.tickets[channel_id].members.remove(member_id)
+            await async_db.remove_ticket_member(str(channel_id), member_id)
+            if channel_id in self.tickets:
+                self.tickets[channel_id].remove_member(member_id)
             self.logger.info(f"Membre {member_id} retiré du ticket {channel_id}")
         except Exception as e:
             self.logger.error(f"Erreur retrait membre: {e}")
 
-    def get_user_open_tickets(self, server_id: str, user_id: int) -> List[TicketData]:
+    async def get_user_open_tickets(self, server_id: str, user_id: int) -> List[TicketData]:
+        if self.loaded:
+            return self._tickets_from_index(self.by_owner, user_id, server_id)
+
+        # Chargement initial échoué : repli sur la BDD
         try:
-            tickets_data = db.get_user_tickets(server_id, str(user_id), is_closed=False)
+            tickets_data = await async_db.get_user_tickets(server_id, str(user_id), is_closed=False)
             return [TicketData.from_db(t) for t in tickets_data]
         except Exception as e:
             self.logger.error(f"Erreur récupération tickets utilisateur: {e}")
             return []
 
-    def set_autoclose_task(self, channel_id: int, task: asyncio.Task):
-        if channel_id in self.autoclose_delays:
-            self.autoclose_delays[channel_id].cancel()
-        self.autoclose_delays[channel_id] = task
+    def get_claimed_tickets(self, staff_id: int, server_id: Optional[str] = None) -> List[TicketData]:
+        """Tickets ouverts pris en charge par un membre du staff (charge de travail)."""
+        return self._tickets_from_index(self.by_claimer, staff_id, server_id)
 
-    def get_autoclose_task(self, channel_id: int) -> Optional[asyncio.Task]:
-        return self.autoclose_delays.get(channel_id)
+    def count_open_tickets(self, type_key: Optional[str] = None) -> int:
+        if type_key is None:
+            return sum(len(channel_ids) for channel_ids in self.by_type.values())
+        return len(self.by_type.get(type_key, ()))
 
-    def cancel_autoclose_task(self, channel_id: int):
-        if channel_id in self.autoclose_delays:
-            self.autoclose_delays[channel_id].cancel()
-            del self.autoclose_delays[channel_id]
-            self.logger.info(f"Tâche auto-close annulée pour {channel_id}")
+    def restore_autoclose_schedule(self, delay_hours: float):
+        """Reconstruit le tas d'échéances depuis les tickets chargés (après un redémarrage)."""
+        restored = 0
+        for ticket in self.tickets.values():
+            if ticket.is_closed:
+                continue
+            deadline = ticket.autoclose_at
+            if deadline is None and ticket.last_staff_message and (
+                not ticket.last_owner_message or ticket.last_staff_message > ticket.last_owner_message
+            ):
+                deadline = ticket.last_staff_message + timedelta(hours=delay_hours)
+            if deadline is not None:
+                ticket.autoclose_at = deadline
+                self.autoclose_scheduler.schedule(ticket.channel_id, deadline)
+                restored += 1
+        self.logger.info(f"{restored} échéances auto-close restaurées")
+
+    def get_autoclose_deadline(self, channel_id: int) -> Optional[datetime]:
+        return self.autoclose_scheduler.get(channel_id)
+
+    async def schedule_autoclose(self, channel_id: int, deadline: datetime):
+        self.autoclose_scheduler.schedule(channel_id, deadline)
+        if channel_id in self.tickets:
+            self.tickets[channel_id].autoclose_at = deadline
+        await async_db.set_ticket_autoclose(str(channel_id), deadline)
+
+    async def clear_autoclose(self, channel_id: int):
+        """Efface une échéance déjà retirée du tas (déclenchée mais ignorée), pour que
+        restore_autoclose_schedule ne la réarme pas au prochain démarrage."""
+        if channel_id in self.tickets:
+            self.tickets[channel_id].autoclose_at = None
+        await async_db.set_ticket_autoclose(str(channel_id), None)
+
+    async def cancel_autoclose(self, channel_id: int) -> bool:
+        if not self.autoclose_scheduler.cancel(channel_id):
+            return False
+        if channel_id in self.tickets:
+            self.tickets[channel_id].autoclose_at = None
+        await async_db.set_ticket_autoclose(str(channel_id), None)
+        self.logger.info(f"Auto-close annulé pour {channel_id}")
+        return True
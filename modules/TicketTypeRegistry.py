@@ -0,0 +1,74 @@
+import json
+import logging
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import discord
+
+
+class TicketType:
+    """Version compilée d'une entrée de Config.TicketTypes."""
+
+    __slots__ = (
+        "key", "name", "description", "staff_role_ids", "ping_role_ids",
+        "category_ids", "overflow_category", "pool_size", "option"
+    )
+
+    def __init__(self, key: str, data: dict):
+        self.key = key
+        self.name: str = data["name"]
+        self.description: str = data.get("description", "")
+        self.staff_role_ids: FrozenSet[int] = frozenset(data.get("staff_roles_id", []))
+        self.ping_role_ids: FrozenSet[int] = frozenset(data.get("roles_to_ping", []))
+        category_ids = data.get("category_id")
+        if category_ids is None:
+            category_ids = ()
+        elif not isinstance(category_ids, (list, tuple)):
+            category_ids = (category_ids,)
+        self.category_ids: Tuple[int, ...] = tuple(category_ids)
+        self.overflow_category: Optional[str] = data.get("overflow_category")
+        self.pool_size: int = int(data.get("pool_size", 0))
+        self.option = discord.SelectOption(label=self.name, description=self.description, value=key)
+
+    def is_staff(self, role_ids: Iterable[int]) -> bool:
+        return not self.staff_role_ids.isdisjoint(role_ids)
+
+
+class TicketTypeRegistry:
+    """Types de tickets compilés une fois au chargement : ensembles d'IDs de rôles pour des
+    vérifications par intersection et SelectOption prêtes à l'emploi.
+
+    refresh() ne reconstruit le registre que si Config.TicketTypes a changé.
+    """
+
+    def __init__(self, ticket_types: Dict[str, dict]):
+        self.logger = logging.getLogger("TicketTypeRegistry")
+        self.types: Dict[str, TicketType] = {}
+        self.select_options: List[discord.SelectOption] = []
+        self._fingerprint: Optional[str] = None
+        self.refresh(ticket_types)
+
+    @staticmethod
+    def _fingerprint_of(ticket_types: Dict[str, dict]) -> str:
+        return json.dumps(ticket_types, sort_keys=True, default=str)
+
+    def refresh(self, ticket_types: Dict[str, dict]) -> bool:
+        fingerprint = self._fingerprint_of(ticket_types)
+        if fingerprint == self._fingerprint:
+            return False
+        self.types = {key: TicketType(key, data) for key, data in ticket_types.items()}
+        self.select_options = [ticket_type.option for ticket_type in self.types.values()]
+        self._fingerprint = fingerprint
+        self.logger.info(f"{len(self.types)} types de tickets chargés")
+        return True
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.types
+
+    def get(self, key: str) -> Optional[TicketType]:
+        return self.types.get(key)
+
+    def is_staff(self, member: discord.Member, type_key: str) -> bool:
+        ticket_type = self.types.get(type_key)
+        if ticket_type is None or not isinstance(member, discord.Member):
+            return False
+        return ticket_type.is_staff(role.id for role in member.roles)
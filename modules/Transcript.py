@@ -0,0 +1,317 @@
+import asyncio
+import gzip
+import html
+import json
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import discord
+
+FORMATS = ("txt", "html", "ndjson")
+SPOOL_MAX_MEMORY = 1024 * 1024  # Au-delà, le fichier temporaire bascule sur disque
+PROGRESS_EVERY = 500
+
+HTML_HEADER = """<!DOCTYPE html>
+<html lang="fr">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ background: #313338; color: #dbdee1; font-family: "Segoe UI", Helvetica, Arial, sans-serif; margin: 0; padding: 24px; }}
+h1 {{ font-size: 20px; color: #f2f3f5; }}
+.message {{ padding: 6px 0; border-bottom: 1px solid #3f4147; }}
+.author {{ font-weight: 600; color: #f2f3f5; }}
+.time {{ color: #949ba4; font-size: 12px; margin-left: 8px; }}
+.content {{ white-space: pre-wrap; word-wrap: break-word; margin-top: 2px; }}
+.deleted {{ opacity: .5; text-decoration: line-through; }}
+.edited {{ color: #949ba4; font-size: 11px; }}
+.attachment {{ margin-top: 4px; }}
+.attachment a {{ color: #00a8fc; }}
+.note {{ color: #949ba4; font-size: 12px; }}
+.embed {{ border-left: 4px solid #1e1f22; background: #2b2d31; border-radius: 4px; padding: 8px 12px; margin-top: 4px; max-width: 520px; }}
+.embed-title {{ font-weight: 600; color: #f2f3f5; }}
+.embed-field {{ margin-top: 4px; }}
+.embed-field-name {{ font-weight: 600; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<p class="note">Les pièces jointes sont des liens vers le CDN Discord, qui expirent au bout de quelques heures hors de Discord.</p>
+"""
+HTML_FOOTER = "<p class=\"time\">{count} messages</p>\n</body>\n</html>\n"
+
+
+def message_to_record(message: discord.Message) -> Dict:
+    """Représentation compacte et sérialisable d'un message, commune à tous les formats."""
+    return {
+        "id": message.id,
+        "author_id": message.author.id,
+        "author": str(message.author),
+        "created_at": message.created_at.isoformat(),
+        "edited_at": message.edited_at.isoformat() if message.edited_at else None,
+        "content": message.content,
+        "attachments": [
+            {
+                "filename": attachment.filename,
+                "url": attachment.url,
+                "size": attachment.size,
+                "content_type": attachment.content_type,
+            }
+            for attachment in message.attachments
+        ],
+        "embeds": [embed.to_dict() for embed in message.embeds],
+    }
+
+
+class TranscriptWriter:
+    """Écrit une transcription message par message dans un fichier temporaire spoolé,
+    éventuellement compressé en gzip, sans jamais garder tout l'historique en mémoire."""
+
+    def __init__(self, title: str, fmt: str = "txt", compress: bool = False):
+        if fmt not in FORMATS:
+            raise ValueError(f"Format de transcription inconnu: {fmt}")
+        self.title = title
+        self.fmt = fmt
+        self.compress = compress
+        self.count = 0
+        self.file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY, mode="w+b")
+        self._stream = gzip.GzipFile(fileobj=self.file, mode="wb") if compress else self.file
+        if fmt == "html":
+            self._write(HTML_HEADER.format(title=html.escape(title)))
+        elif fmt == "txt":
+            self._write(f"{title}\n\n")
+
+    @property
+    def extension(self) -> str:
+        return f"{self.fmt}.gz" if self.compress else self.fmt
+
+    def _write(self, text: str):
+        self._stream.write(text.encode("utf-8"))
+
+    def add(self, record: Dict):
+        self.count += 1
+        if self.fmt == "ndjson":
+            self._write(json.dumps(record, ensure_ascii=False) + "\n")
+        elif self.fmt == "html":
+            self._write(self._render_html(record))
+        else:
+            self._write(self._render_txt(record))
+
+    def add_all(self, records: Iterable[Dict]):
+        for record in records:
+            self.add(record)
+
+    def finish(self) -> Tuple[tempfile.SpooledTemporaryFile, int]:
+        """Termine l'écriture et retourne le fichier rembobiné ainsi que sa taille en octets."""
+        if self.fmt == "html":
+            self._write(HTML_FOOTER.format(count=self.count))
+        if self.compress:
+            self._stream.close()
+        size = self.file.tell()
+        self.file.seek(0)
+        return self.file, size
+
+    def close(self):
+        self.file.close()
+
+    @staticmethod
+    def _render_txt(record: Dict) -> str:
+        lines = [f"[{record['created_at']}] {record['author']}: {record['content']}"]
+        if record.get("deleted"):
+            lines[0] += " (supprimé)"
+        for attachment in record.get("attachments", []):
+            lines.append(f"    📎 {attachment['filename']} <{attachment['url']}>")
+        for embed in record.get("embeds", []):
+            title = embed.get("title") or embed.get("description") or ""
+            if title:
+                lines.append(f"    [embed] {title}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _render_html(record: Dict) -> str:
+        classes = "message deleted" if record.get("deleted") else "message"
+        created_at = datetime.fromisoformat(record["created_at"]).strftime("%d/%m/%Y %H:%M:%S")
+        parts = [
+            f'<div class="{classes}" id="m{record["id"]}">',
+            f'<span class="author">{html.escape(record["author"])}</span><span class="time">{created_at}</span>',
+        ]
+        if record.get("edited_at"):
+            parts.append('<span class="edited"> (modifié)</span>')
+        if record.get("content"):
+            parts.append(f'<div class="content">{html.escape(record["content"])}</div>')
+        for attachment in record.get("attachments", []):
+            # Simple lien plutôt qu'une image intégrée : l'URL signée du CDN finit par expirer
+            url = html.escape(attachment["url"], quote=True)
+            name = html.escape(attachment["filename"])
+            size = f' <span class="time">({round(attachment["size"] / 1024)} Ko)</span>' if attachment.get("size") else ""
+            parts.append(f'<div class="attachment">📎 <a href="{url}">{name}</a>{size}</div>')
+        for embed in record.get("embeds", []):
+            color = f"#{embed['color']:06x}" if embed.get("color") is not None else "#1e1f22"
+            parts.append(f'<div class="embed" style="border-left-color: {color}">')
+            if embed.get("title"):
+                parts.append(f'<div class="embed-title">{html.escape(embed["title"])}</div>')
+            if embed.get("description"):
+                parts.append(f'<div class="content">{html.escape(embed["description"])}</div>')
+            for field in embed.get("fields", []):
+                parts.append(
+                    f'<div class="embed-field"><div class="embed-field-name">{html.escape(field.get("name", ""))}</div>'
+                    f'<div class="content">{html.escape(field.get("value", ""))}</div></div>'
+                )
+            parts.append("</div>")
+        parts.append("</div>\n")
+        return "".join(parts)
+
+
+def transcript_title(channel: discord.abc.GuildChannel) -> str:
+    return f"Transcription #{channel.name} ({channel.id})"
+
+
+async def write_channel_transcript(
+    channel: discord.TextChannel,
+    fmt: str = "txt",
+    compress: bool = False,
+    progress: Optional[Callable[[int], Awaitable[None]]] = None
+) -> Tuple[TranscriptWriter, tempfile.SpooledTemporaryFile, int]:
+    """Parcourt l'historique du canal en flux et l'écrit au fil de l'eau dans un TranscriptWriter."""
+    writer = TranscriptWriter(transcript_title(channel), fmt, compress)
+    try:
+        async for message in channel.history(limit=None, oldest_first=True):
+            writer.add(message_to_record(message))
+            if progress and writer.count % PROGRESS_EVERY == 0:
+                await progress(writer.count)
+        file, size = writer.finish()
+        return writer, file, size
+    except Exception:
+        writer.close()
+        raise
+
+
+class TranscriptStore:
+    """Journal append-only des messages de chaque ticket, un fichier NDJSON par canal.
+
+    Les entrées sont bufferisées en mémoire puis ajoutées en fin de fichier par flush().
+    Toutes les écritures/lectures passent par un unique thread, ce qui préserve l'ordre
+    et ne bloque pas la boucle asyncio. Un journal n'est complet que s'il commence par
+    l'entrée "start" écrite à la création du ticket.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._pending: Dict[int, List[str]] = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="transcripts")
+
+    def _path(self, channel_id: int) -> Path:
+        return self.directory / f"{channel_id}.ndjson"
+
+    def _append(self, channel_id: int, entry: Dict):
+        self._pending.setdefault(channel_id, []).append(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def start(self, channel_id: int):
+        self._append(channel_id, {"event": "start", "channel_id": channel_id, "at": datetime.now().isoformat()})
+
+    def append_message(self, channel_id: int, record: Dict):
+        self._append(channel_id, {"event": "message", **record})
+
+    def append_edit(self, channel_id: int, message_id: int, content: str, edited_at: Optional[str]):
+        self._append(channel_id, {"event": "edit", "id": message_id, "content": content, "edited_at": edited_at})
+
+    def append_delete(self, channel_id: int, message_id: int):
+        self._append(channel_id, {"event": "delete", "id": message_id})
+
+    async def _submit(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _write(self, pending: Dict[int, List[str]]):
+        for channel_id, lines in pending.items():
+            with self._path(channel_id).open("a", encoding="utf-8") as f:
+                f.writelines(lines)
+
+    async def flush(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        await self._submit(self._write, pending)
+
+    def _read_records(self, channel_id: int) -> Iterator[Dict]:
+        path = self._path(channel_id)
+        # 1re passe : seules les modifications et suppressions sont gardées en mémoire
+        edits: Dict[int, Dict] = {}
+        deleted = set()
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                if entry["event"] == "edit":
+                    edits[entry["id"]] = entry
+                elif entry["event"] == "delete":
+                    deleted.add(entry["id"])
+        # 2e passe : les messages sont restitués dans l'ordre, corrections appliquées
+        with path.open("r", encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                if entry.pop("event") != "message":
+                    continue
+                edit = edits.get(entry["id"])
+                if edit:
+                    entry["content"] = edit["content"]
+                    entry["edited_at"] = edit["edited_at"]
+                if entry["id"] in deleted:
+                    entry["deleted"] = True
+                yield entry
+
+    def _is_complete(self, channel_id: int) -> bool:
+        path = self._path(channel_id)
+        if not path.exists():
+            return False
+        with path.open("r", encoding="utf-8") as f:
+            first_line = f.readline()
+        return bool(first_line) and json.loads(first_line).get("event") == "start"
+
+    def _build(self, pending: Dict[int, List[str]], channel_id: int, title: str, fmt: str, compress: bool):
+        self._write(pending)
+        if not self._is_complete(channel_id):
+            return None
+        writer = TranscriptWriter(title, fmt, compress)
+        try:
+            writer.add_all(self._read_records(channel_id))
+            file, size = writer.finish()
+            return writer, file, size
+        except Exception:
+            writer.close()
+            raise
+
+    async def build_transcript(
+        self, channel_id: int, title: str, fmt: str = "txt", compress: bool = False
+    ) -> Optional[Tuple[TranscriptWriter, tempfile.SpooledTemporaryFile, int]]:
+        """Transcription depuis le journal local, ou None si celui-ci est incomplet
+        (ticket ouvert avant la capture en direct)."""
+        pending = {channel_id: self._pending.pop(channel_id)} if channel_id in self._pending else {}
+        return await self._submit(self._build, pending, channel_id, title, fmt, compress)
+
+    def _save_archive(self, file, filename: str) -> Path:
+        archive_dir = self.directory / "archives"
+        archive_dir.mkdir(exist_ok=True)
+        path = archive_dir / filename
+        with path.open("wb") as destination:
+            shutil.copyfileobj(file, destination)
+        return path
+
+    async def save_archive(self, file, filename: str) -> Path:
+        """Copie une transcription terminée dans le sous-dossier archives du journal."""
+        return await self._submit(self._save_archive, file, filename)
+
+    def _delete(self, channel_id: int):
+        self._path(channel_id).unlink(missing_ok=True)
+
+    async def delete(self, channel_id: int):
+        self._pending.pop(channel_id, None)
+        await self._submit(self._delete, channel_id)
+
+    async def close(self):
+        await self.flush()
+        self._executor.shutdown(wait=True)
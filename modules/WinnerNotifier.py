@@ -0,0 +1,91 @@
+import asyncio
+import logging
+from typing import List, Optional
+
+import aiohttp
+import discord
+
+RETRY_BASE_DELAY = 1  # Secondes avant la première nouvelle tentative, doublées à chaque essai
+
+
+class NotificationReport:
+    """Résultat d'un envoi de MP aux gagnants."""
+
+    __slots__ = ("delivered", "closed", "missing", "failed")
+
+    def __init__(self):
+        self.delivered: List[int] = []
+        self.closed: List[int] = []  # MP fermés (403)
+        self.missing: List[int] = []  # Utilisateur introuvable
+        self.failed: List[int] = []  # Échec après toutes les tentatives
+
+    @property
+    def undelivered(self) -> List[int]:
+        return self.closed + self.missing + self.failed
+
+    def summary(self) -> str:
+        total = len(self.delivered) + len(self.undelivered)
+        lines = [f"✅ {len(self.delivered)}/{total} envoyé(s)"]
+        if self.closed:
+            lines.append("🔒 MP fermés : " + ", ".join(f"<@{user_id}>" for user_id in self.closed))
+        if self.missing:
+            lines.append("❓ Introuvables : " + ", ".join(f"<@{user_id}>" for user_id in self.missing))
+        if self.failed:
+            lines.append("⚠️ Échecs : " + ", ".join(f"<@{user_id}>" for user_id in self.failed))
+        return "\n".join(lines)[:1024]
+
+
+class WinnerNotifier:
+    """Envoie les MP aux gagnants en parallèle, avec un nombre borné d'envois simultanés.
+
+    Les utilisateurs sont pris dans le cache du bot avant de recourir à fetch_user. Les erreurs
+    transitoires (5xx, réseau, 429 non absorbé par discord.py) sont retentées avec un délai
+    exponentiel ; un 403 (MP fermés) ou un 404 est définitif.
+    """
+
+    def __init__(self, bot: discord.Client, concurrency: int = 5, attempts: int = 3):
+        self.bot = bot
+        self.semaphore = asyncio.Semaphore(max(1, concurrency))
+        self.attempts = max(1, attempts)
+        self.logger = logging.getLogger("WinnerNotifier")
+
+    async def resolve_user(self, user_id: int) -> Optional[discord.User]:
+        user = self.bot.get_user(user_id)
+        if user is not None:
+            return user
+        try:
+            return await self.bot.fetch_user(user_id)
+        except discord.NotFound:
+            return None
+
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        if isinstance(error, discord.HTTPException):
+            return error.status == 429 or error.status >= 500
+        return isinstance(error, (aiohttp.ClientError, asyncio.TimeoutError))
+
+    async def _notify_one(self, user_id: int, embed: discord.Embed, report: NotificationReport):
+        async with self.semaphore:
+            for attempt in range(self.attempts):
+                try:
+                    user = await self.resolve_user(user_id)
+                    if user is None:
+                        report.missing.append(user_id)
+                        return
+                    await user.send(embed=embed)
+                    report.delivered.append(user_id)
+                    return
+                except discord.Forbidden:
+                    report.closed.append(user_id)
+                    return
+                except Exception as e:
+                    if not self._is_transient(e) or attempt == self.attempts - 1:
+                        self.logger.warning(f"Impossible d'envoyer un MP au gagnant {user_id} : {str(e)}")
+                        report.failed.append(user_id)
+                        return
+                    await asyncio.sleep(RETRY_BASE_DELAY * 2 ** attempt)
+
+    async def notify(self, user_ids: List[int], embed: discord.Embed) -> NotificationReport:
+        report = NotificationReport()
+        await asyncio.gather(*(self._notify_one(int(user_id), embed, report) for user_id in user_ids))
+        return report
@@ -15,15 +15,26 @@ CREATE TABLE giveaways(
     giveaway_winner_count INT NOT NULL,
     giveaway_end_date TIMESTAMP NOT NULL,
     giveaway_organizer_id VARCHAR(255) NOT NULL,
-    giveaway_participants TEXT,
     giveaway_conditions TEXT,
     giveaway_is_finished BOOLEAN DEFAULT FALSE,
+    giveaway_state VARCHAR(16) NOT NULL DEFAULT 'active',
+    giveaway_winners TEXT NULL,
+    giveaway_claim_token VARCHAR(32) NULL,
+    giveaway_claimed_at TIMESTAMP NULL DEFAULT NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     INDEX idx_server_id (server_id),
     INDEX idx_is_finished (giveaway_is_finished),
     INDEX idx_message_id (giveaway_message_id)
 );
 
+CREATE TABLE giveaway_participants (
+    giveaway_id VARCHAR(255) NOT NULL,
+    user_id BIGINT UNSIGNED NOT NULL,
+    joined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (giveaway_id, user_id),
+    FOREIGN KEY (giveaway_id) REFERENCES giveaways(giveaway_id) ON DELETE CASCADE
+);
+
 CREATE TABLE tickets (
     ticket_id INT AUTO_INCREMENT PRIMARY KEY,
     server_id VARCHAR(255) NOT NULL,
@@ -34,13 +45,23 @@ CREATE TABLE tickets (
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     last_owner_message TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     last_staff_message TIMESTAMP,
-    members TEXT,
+    autoclose_at TIMESTAMP NULL DEFAULT NULL,
     is_closed BOOLEAN DEFAULT FALSE,
     closed_at TIMESTAMP,
     closed_by_id VARCHAR(255),
     close_reason TEXT,
+    archived_at TIMESTAMP NULL DEFAULT NULL,
     INDEX idx_server_id (server_id),
     INDEX idx_owner_id (owner_id),
     INDEX idx_channel_id (channel_id),
     INDEX idx_is_closed (is_closed)
+);
+
+CREATE TABLE ticket_members (
+    channel_id VARCHAR(255) NOT NULL,
+    member_id BIGINT UNSIGNED NOT NULL,
+    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (channel_id, member_id),
+    INDEX idx_member_id (member_id),
+    FOREIGN KEY (channel_id) REFERENCES tickets(channel_id) ON DELETE CASCADE
 );
\ No newline at end of file